@@ -1,30 +1,36 @@
 """WIP - Task tracker CLI with tree visualization."""
 
+import heapq
 import json
+import os
 from datetime import datetime, timedelta
+from itertools import chain
 from pathlib import Path
 
 import click
 
 from .model import BlockedTask, Edge, HistoryEntry, State, Task
-from .render import (
-    render_blocked,
-    render_dag,
-    render_dag_simple,
-    render_history_table,
-    render_recent_history,
-    render_recent_history_simple,
-    render_stale_tasks,
-    render_weekly_simple,
-    render_weekly_table,
-)
 from .iterm2 import is_iterm2
-from .storage import backup_state, load_state, save_state
+from .storage import backup_state, decode_json, dump_json, load_state, save_state
 
 
 CONTEXT_SETTINGS = {"help_option_names": ["-h", "--help"]}
 
 
+def _use_simple_render() -> bool:
+    """Use the plain-text renderers instead of Rich panels.
+
+    Always in iTerm2 (needed for inline images), or on request with
+    WIP_SIMPLE_RENDER=1, since they skip importing and laying out Rich.
+    """
+    return is_iterm2() or os.environ.get("WIP_SIMPLE_RENDER") == "1"
+
+
+def _now_iso() -> str:
+    """Current local time as a fixed-width ISO 8601 string."""
+    return datetime.now().isoformat(timespec="seconds")
+
+
 @click.group(invoke_without_command=True, context_settings=CONTEXT_SETTINGS)
 @click.version_option(version="0.1.0")
 @click.pass_context
@@ -38,6 +44,8 @@ def main(ctx):
 @click.option("--done", is_flag=True, help="Show completed tasks with dates")
 def status(done: bool):
     """Show tasks with tree visualization and blocked list."""
+    from .render import render_blocked, render_dag, render_dag_simple, render_history_table
+
     state = load_state()
 
     if done:
@@ -55,7 +63,7 @@ def status(done: bool):
 
     # Use simple renderer for iTerm2 (supports inline images)
     # Use Rich panels for other terminals
-    if is_iterm2():
+    if _use_simple_render():
         render_dag_simple(state)
     else:
         render_dag(state)
@@ -65,6 +73,8 @@ def status(done: bool):
 @main.command()
 def weekly():
     """Show tasks completed this week."""
+    from .render import render_weekly_simple, render_weekly_table
+
     state = load_state()
 
     if not state.history:
@@ -73,23 +83,19 @@ def weekly():
 
     # Get Monday of current week
     today = datetime.now()
-    monday = today - __import__("datetime").timedelta(days=today.weekday())
+    monday = today - timedelta(days=today.weekday())
     monday = monday.replace(hour=0, minute=0, second=0, microsecond=0)
-    sunday = monday + __import__("datetime").timedelta(days=6)
+    sunday = monday + timedelta(days=6)
 
-    # Filter tasks completed this week
-    week_tasks = []
-    for entry in state.history:
-        completed_dt = entry.completed_datetime
-        if completed_dt >= monday:
-            week_tasks.append(entry)
+    # Filter tasks completed this week (timestamp parses are cached per string)
+    week_tasks = [entry for entry in state.history if entry.completed_datetime >= monday]
 
     if not week_tasks:
         click.echo("No tasks completed this week.")
         return
 
     # Use simple renderer for iTerm2 (supports inline images)
-    if is_iterm2():
+    if _use_simple_render():
         render_weekly_simple(week_tasks, monday, sunday)
     else:
         render_weekly_table(week_tasks, monday, sunday)
@@ -99,22 +105,20 @@ def weekly():
 @click.option("-n", "--count", default=10, help="Number of recent tasks to show")
 def history(count: int):
     """Show recently completed tasks."""
+    from .render import render_recent_history, render_recent_history_simple
+
     state = load_state()
 
     if not state.history:
         click.echo("No completed tasks.")
         return
 
-    # Sort by completed_at descending and take the most recent
-    sorted_history = sorted(
-        state.history,
-        key=lambda e: e.completed_at or "",
-        reverse=True,
-    )
-    recent = sorted_history[:count]
+    # Take the most recent by completed_at without sorting the whole history.
+    # History is mostly chronological, but merged imports can append older entries.
+    recent = heapq.nlargest(count, state.history, key=lambda e: e.completed_at or "")
 
     # Use simple renderer for iTerm2 (supports inline images)
-    if is_iterm2():
+    if _use_simple_render():
         render_recent_history_simple(recent)
     else:
         render_recent_history(recent)
@@ -123,23 +127,22 @@ def history(count: int):
 @main.command()
 def stale():
     """Show tasks older than stale_days that are not active."""
+    from .render import render_stale_tasks
+
     state = load_state()
     stale_days = state.config.stale_days
     cutoff = datetime.now() - timedelta(days=stale_days)
 
-    stale_tasks = []
-    for task in state.tasks.values():
-        if not task.active:
-            created = task.created_datetime
-            if created and created < cutoff:
-                stale_tasks.append(task)
+    stale_tasks = [
+        task for task in state.tasks.values()
+        if not task.active and task.created_at and task.created_datetime < cutoff
+    ]
 
     # Also check blocked tasks
-    stale_blocked = []
-    for blocked in state.blocked:
-        created = blocked.created_datetime
-        if created and created < cutoff:
-            stale_blocked.append(blocked)
+    stale_blocked = [
+        blocked for blocked in state.blocked
+        if blocked.created_at and blocked.created_datetime < cutoff
+    ]
 
     if not stale_tasks and not stale_blocked:
         click.echo(f"No stale tasks (older than {stale_days} days).")
@@ -156,18 +159,18 @@ def add(title: str, blocked: str | None):
     state = load_state()
     task_id = state.next_id
     state.next_id += 1
-    now = datetime.now().isoformat()
+    now = _now_iso()
 
     if blocked:
         # Add as blocked task
         blocked_task = BlockedTask(id=task_id, title=title, blocker=blocked, created_at=now)
-        state.blocked.append(blocked_task)
+        state.add_blocked(blocked_task)
         save_state(state)
         click.echo(f"Added blocked task [{task_id}]: {title} (blocked by: {blocked})")
     else:
         # Add as regular task
         task = Task(id=task_id, title=title, created_at=now)
-        state.tasks[str(task_id)] = task
+        state.add_task(task)
         save_state(state)
         click.echo(f"Added task [{task_id}]: {title}")
 
@@ -175,6 +178,12 @@ def add(title: str, blocked: str | None):
 def _would_create_cycle(state, from_id: int, to_id: int) -> bool:
     """Check if adding edge from_id -> to_id would create a cycle using DFS."""
     # If we can reach from_id starting from to_id, adding from_id -> to_id creates a cycle
+    if from_id == to_id:
+        return True
+    adj = state.get_adjacency()
+    # No path can leave to_id or enter from_id, so no cycle is possible
+    if to_id not in adj or from_id not in state.get_reverse_adjacency():
+        return False
     visited = set()
     stack = [to_id]
 
@@ -185,8 +194,7 @@ def _would_create_cycle(state, from_id: int, to_id: int) -> bool:
         if node in visited:
             continue
         visited.add(node)
-        for edge in state.get_edges_from(node):
-            stack.append(edge.to_id)
+        stack.extend(adj.get(node, ()))
 
     return False
 
@@ -198,30 +206,29 @@ def _task_exists(state, task_id: int) -> bool:
 
 def _get_all_descendants(state, task_id: int) -> set[int]:
     """Get all tasks that depend on the given task (directly or indirectly)."""
+    adj = state.get_adjacency()
     descendants: set[int] = set()
     stack = [task_id]
     while stack:
         current = stack.pop()
-        for edge in state.edges:
-            if edge.from_id == current and edge.to_id not in descendants:
-                descendants.add(edge.to_id)
-                stack.append(edge.to_id)
+        for child_id in adj.get(current, ()):
+            if child_id not in descendants:
+                descendants.add(child_id)
+                stack.append(child_id)
     return descendants
 
 
-def _move_to_hold(state, task_id: int, blocker: str) -> str | None:
-    """Move a task to on hold. Returns the task title if moved, None if already on hold."""
-    task = state.get_task(task_id)
-    if not task:
-        return None  # Already on hold or doesn't exist
-
-    # Remove from tasks and add to blocked
-    del state.tasks[str(task_id)]
-    blocked_task = BlockedTask(
-        id=task_id, title=task.title, blocker=blocker, created_at=task.created_at
-    )
-    state.blocked.append(blocked_task)
-    return task.title
+def _move_to_hold(state, task_ids, blocker: str) -> list[BlockedTask]:
+    """Move tasks to on hold. Returns the moved tasks; ones already on hold are skipped."""
+    tasks = [task for task in map(state.get_task, sorted(task_ids)) if task]
+    held = [
+        BlockedTask(id=task.id, title=task.title, blocker=blocker, created_at=task.created_at)
+        for task in tasks
+    ]
+    for task in tasks:
+        state.remove_task(task.id)
+    state.add_blocked(*held)
+    return held
 
 
 @main.command()
@@ -232,7 +239,8 @@ def link(from_id: int, to_id: int):
     state = load_state()
 
     # Verify both tasks exist (in tasks or blocked)
-    if not _task_exists(state, from_id):
+    blocked_parent = state.get_blocked(from_id)
+    if not blocked_parent and not state.get_task(from_id):
         click.echo(f"Error: Task {from_id} not found", err=True)
         return
     if not _task_exists(state, to_id):
@@ -254,18 +262,14 @@ def link(from_id: int, to_id: int):
         click.echo(f"Error: Adding edge {from_id} -> {to_id} would create a cycle", err=True)
         return
 
-    state.edges.append(Edge(from_id=from_id, to_id=to_id))
+    state.add_edge(from_id, to_id)
 
     # If from_id is on hold, cascade to to_id and all its descendants
-    blocked_parent = state.get_blocked(from_id)
     if blocked_parent:
-        moved_tasks: list[str] = []
         # Move to_id and all its descendants to hold
         all_to_move = {to_id} | _get_all_descendants(state, to_id)
-        for tid in all_to_move:
-            title = _move_to_hold(state, tid, f"Task {from_id}")
-            if title:
-                moved_tasks.append(f"[{tid}] {title}")
+        held = _move_to_hold(state, all_to_move, f"Task {from_id}")
+        moved_tasks = [f"[{b.id}] {b.title}" for b in held]
 
         save_state(state)
         click.echo(f"Linked task {from_id} -> {to_id}")
@@ -287,14 +291,188 @@ def unlink(from_id: int, to_id: int):
         click.echo(f"Error: Edge {from_id} -> {to_id} not found", err=True)
         return
 
-    state.edges = [e for e in state.edges if not (e.from_id == from_id and e.to_id == to_id)]
+    state.remove_edge(from_id, to_id)
     save_state(state)
     click.echo(f"Unlinked task {from_id} -> {to_id}")
 
 
+def _get_task_not_on_hold(state, task_id: int) -> Task | None:
+    """Get a task for a state change, reporting why it can't be changed if missing."""
+    task = state.get_task(task_id)
+    if task:
+        return task
+    if state.get_blocked(task_id):
+        click.echo(
+            f"Error: Task {task_id} is on hold. Use 'wip mark {task_id} release' first.",
+            err=True,
+        )
+    else:
+        click.echo(f"Error: Task {task_id} not found", err=True)
+    return None
+
+
+def _mark_active(state: State, task_id: int, by: str | None) -> None:
+    """Mark a task as active."""
+    task = _get_task_not_on_hold(state, task_id)
+    if not task:
+        return
+
+    if task.active:
+        click.echo(f"Task {task_id} is already active")
+        return
+
+    # Check for incomplete dependencies
+    dependencies = state.get_edges_to(task_id)
+    if dependencies:
+        dep_ids = [str(e.from_id) for e in dependencies]
+        click.echo(
+            f"Error: Cannot activate task {task_id}. "
+            f"It depends on incomplete tasks [{', '.join(dep_ids)}]. "
+            f"Complete those first.",
+            err=True,
+        )
+        return
+
+    # Check max_active limit
+    current_active = state.active_count()
+    if current_active >= state.config.max_active:
+        click.echo(
+            f"Error: Maximum active tasks ({state.config.max_active}) reached. "
+            f"Use 'wip mark <id> inactive' or 'wip mark <id> done' first.",
+            err=True,
+        )
+        return
+
+    state.set_active(task, True)
+    save_state(state)
+    click.echo(f"Marked task [{task_id}] as active")
+
+
+def _mark_inactive(state: State, task_id: int, by: str | None) -> None:
+    """Mark an active task as inactive."""
+    task = _get_task_not_on_hold(state, task_id)
+    if not task:
+        return
+
+    if not task.active:
+        click.echo(f"Task {task_id} is not active")
+        return
+
+    state.set_active(task, False)
+    save_state(state)
+    click.echo(f"Marked task [{task_id}] as inactive")
+
+
+def _mark_done(state: State, task_id: int, by: str | None) -> None:
+    """Complete a task and move it to history."""
+    task = _get_task_not_on_hold(state, task_id)
+    if not task:
+        return
+
+    # Check for incomplete dependencies (tasks this task depends on)
+    dependencies = state.get_edges_to(task_id)
+    if dependencies:
+        dep_ids = [str(e.from_id) for e in dependencies]
+        click.echo(
+            f"Error: Cannot complete task {task_id}. "
+            f"It depends on incomplete tasks [{', '.join(dep_ids)}]. "
+            f"Complete those first.",
+            err=True,
+        )
+        return
+
+    # Remove from tasks
+    state.remove_task(task_id)
+
+    # Remove any edges connected to this task
+    state.remove_task_edges(task_id)
+
+    # Add to history
+    now = _now_iso()
+    entry = HistoryEntry(
+        id=task_id, title=task.title, completed_at=now, created_at=task.created_at
+    )
+    state.add_history(entry)
+
+    save_state(state)
+    click.echo(f"Completed task [{task_id}]: {task.title}")
+
+
+def _mark_hold(state: State, task_id: int, by: str | None) -> None:
+    """Put a task on hold. The caller ensures --by is set."""
+    task = state.get_task(task_id)
+    if not task:
+        # Check if it's already on hold
+        if state.get_blocked(task_id):
+            click.echo(f"Error: Task {task_id} is already on hold", err=True)
+            return
+        click.echo(f"Error: Task {task_id} not found", err=True)
+        return
+
+    # Remove from tasks and add to blocked (keep edges for tree display)
+    state.remove_task(task_id)
+    blocked_task = BlockedTask(
+        id=task_id, title=task.title, blocker=by, created_at=task.created_at
+    )
+    state.add_blocked(blocked_task)
+    save_state(state)
+    click.echo(f"Task [{task_id}] on hold ({by})")
+
+
+def _mark_release(state: State, task_id: int, by: str | None) -> None:
+    """Release a task from hold."""
+    # Remove from blocked and add to tasks
+    blocked = state.remove_blocked(task_id)
+    if not blocked:
+        click.echo(f"Error: Task {task_id} not found in hold", err=True)
+        return
+
+    task = Task(id=task_id, title=blocked.title, created_at=blocked.created_at)
+    state.add_task(task)
+    save_state(state)
+    click.echo(f"Released task [{task_id}]: {blocked.title}")
+
+
+def _mark_gone(state: State, task_id: int, by: str | None) -> None:
+    """Delete a task from tasks, hold or history."""
+    # Try to remove from tasks
+    task = state.remove_task(task_id)
+    if task:
+        state.remove_task_edges(task_id)
+        save_state(state)
+        click.echo(f"Task [{task_id}] gone: {task.title}")
+        return
+
+    # Try to remove from blocked
+    blocked = state.remove_blocked(task_id)
+    if blocked:
+        save_state(state)
+        click.echo(f"Task [{task_id}] gone: {blocked.title}")
+        return
+
+    # Try to remove from history
+    entry = state.remove_history(task_id)
+    if entry:
+        save_state(state)
+        click.echo(f"Task [{task_id}] gone: {entry.title}")
+        return
+
+    click.echo(f"Error: Task {task_id} not found", err=True)
+
+
+_MARK_HANDLERS = {
+    "active": _mark_active,
+    "inactive": _mark_inactive,
+    "done": _mark_done,
+    "hold": _mark_hold,
+    "release": _mark_release,
+    "gone": _mark_gone,
+}
+
+
 @main.command()
 @click.argument("task_id", type=int)
-@click.argument("state_name", type=click.Choice(["active", "inactive", "done", "hold", "release", "gone"]))
+@click.argument("state_name", type=click.Choice(list(_MARK_HANDLERS)))
 @click.option("--by", help="Who/what is holding this task (required for 'hold' state)")
 def mark(task_id: int, state_name: str, by: str | None):
     """Mark a task with a state: active, inactive, done, hold, release, gone.
@@ -326,175 +504,12 @@ def mark(task_id: int, state_name: str, by: str | None):
     │            inactive)                           │
     └────────────────────────────────────────────────┘
     """
-    state = load_state()
-
-    if state_name == "active":
-        task = state.get_task(task_id)
-        if not task:
-            # Check if it's on hold
-            if state.get_blocked(task_id):
-                click.echo(
-                    f"Error: Task {task_id} is on hold. Use 'wip mark {task_id} release' first.",
-                    err=True,
-                )
-                return
-            click.echo(f"Error: Task {task_id} not found", err=True)
-            return
-
-        if task.active:
-            click.echo(f"Task {task_id} is already active")
-            return
-
-        # Check for incomplete dependencies
-        dependencies = state.get_edges_to(task_id)
-        if dependencies:
-            dep_ids = [str(e.from_id) for e in dependencies]
-            click.echo(
-                f"Error: Cannot activate task {task_id}. "
-                f"It depends on incomplete tasks [{', '.join(dep_ids)}]. "
-                f"Complete those first.",
-                err=True,
-            )
-            return
-
-        # Check max_active limit
-        current_active = state.active_count()
-        if current_active >= state.config.max_active:
-            click.echo(
-                f"Error: Maximum active tasks ({state.config.max_active}) reached. "
-                f"Use 'wip mark <id> inactive' or 'wip mark <id> done' first.",
-                err=True,
-            )
-            return
-
-        task.active = True
-        save_state(state)
-        click.echo(f"Marked task [{task_id}] as active")
-
-    elif state_name == "inactive":
-        task = state.get_task(task_id)
-        if not task:
-            # Check if it's on hold
-            if state.get_blocked(task_id):
-                click.echo(
-                    f"Error: Task {task_id} is on hold. Use 'wip mark {task_id} release' first.",
-                    err=True,
-                )
-                return
-            click.echo(f"Error: Task {task_id} not found", err=True)
-            return
-
-        if not task.active:
-            click.echo(f"Task {task_id} is not active")
-            return
-
-        task.active = False
-        save_state(state)
-        click.echo(f"Marked task [{task_id}] as inactive")
-
-    elif state_name == "done":
-        task = state.get_task(task_id)
-        if not task:
-            # Check if it's on hold
-            if state.get_blocked(task_id):
-                click.echo(
-                    f"Error: Task {task_id} is on hold. Use 'wip mark {task_id} release' first.",
-                    err=True,
-                )
-                return
-            click.echo(f"Error: Task {task_id} not found", err=True)
-            return
-
-        # Check for incomplete dependencies (tasks this task depends on)
-        dependencies = state.get_edges_to(task_id)
-        if dependencies:
-            dep_ids = [str(e.from_id) for e in dependencies]
-            click.echo(
-                f"Error: Cannot complete task {task_id}. "
-                f"It depends on incomplete tasks [{', '.join(dep_ids)}]. "
-                f"Complete those first.",
-                err=True,
-            )
-            return
-
-        # Remove from tasks
-        del state.tasks[str(task_id)]
-
-        # Remove any edges connected to this task
-        state.edges = [e for e in state.edges if e.from_id != task_id and e.to_id != task_id]
-
-        # Add to history
-        now = datetime.now().isoformat()
-        entry = HistoryEntry(
-            id=task_id, title=task.title, completed_at=now, created_at=task.created_at
-        )
-        state.history.append(entry)
-
-        save_state(state)
-        click.echo(f"Completed task [{task_id}]: {task.title}")
-
-    elif state_name == "hold":
-        if not by:
-            click.echo("Error: --by option is required for 'hold' state", err=True)
-            return
-
-        task = state.get_task(task_id)
-        if not task:
-            # Check if it's already on hold
-            if state.get_blocked(task_id):
-                click.echo(f"Error: Task {task_id} is already on hold", err=True)
-                return
-            click.echo(f"Error: Task {task_id} not found", err=True)
-            return
-
-        # Remove from tasks and add to blocked (keep edges for tree display)
-        del state.tasks[str(task_id)]
-        blocked_task = BlockedTask(
-            id=task_id, title=task.title, blocker=by, created_at=task.created_at
-        )
-        state.blocked.append(blocked_task)
-        save_state(state)
-        click.echo(f"Task [{task_id}] on hold ({by})")
-
-    elif state_name == "release":
-        blocked = state.get_blocked(task_id)
-        if not blocked:
-            click.echo(f"Error: Task {task_id} not found in hold", err=True)
-            return
-
-        # Remove from blocked and add to tasks
-        state.blocked = [b for b in state.blocked if b.id != task_id]
-        task = Task(id=task_id, title=blocked.title, created_at=blocked.created_at)
-        state.tasks[str(task_id)] = task
-        save_state(state)
-        click.echo(f"Released task [{task_id}]: {blocked.title}")
-
-    elif state_name == "gone":
-        # Try to remove from tasks
-        if str(task_id) in state.tasks:
-            task = state.tasks.pop(str(task_id))
-            state.edges = [e for e in state.edges if e.from_id != task_id and e.to_id != task_id]
-            save_state(state)
-            click.echo(f"Task [{task_id}] gone: {task.title}")
-            return
-
-        # Try to remove from blocked
-        for i, blocked in enumerate(state.blocked):
-            if blocked.id == task_id:
-                state.blocked.pop(i)
-                save_state(state)
-                click.echo(f"Task [{task_id}] gone: {blocked.title}")
-                return
-
-        # Try to remove from history
-        for i, entry in enumerate(state.history):
-            if entry.id == task_id:
-                state.history.pop(i)
-                save_state(state)
-                click.echo(f"Task [{task_id}] gone: {entry.title}")
-                return
+    if state_name == "hold" and not by:
+        click.echo("Error: --by option is required for 'hold' state", err=True)
+        return
 
-        click.echo(f"Error: Task {task_id} not found", err=True)
+    state = load_state()
+    _MARK_HANDLERS[state_name](state, task_id, by)
 
 
 @main.command()
@@ -549,7 +564,7 @@ def reset():
 
     # Preserve config, reset everything else
     config = state.config
-    state = __import__("wip.model", fromlist=["State"]).State()
+    state = State()
     state.config = config
 
     save_state(state)
@@ -562,7 +577,7 @@ def save(file: str):
     """Save all tasks to a file."""
     state = load_state()
     path = Path(file)
-    path.write_text(json.dumps(state.to_dict(), indent=2))
+    dump_json(state.to_dict(), path, indent=True)
     task_count = len(state.tasks) + len(state.blocked)
     click.echo(f"Saved {task_count} tasks to {file}")
 
@@ -572,62 +587,32 @@ def _remap_state(imported: State, start_id: int) -> tuple[State, dict[int, int]]
 
     Returns the remapped state and the ID mapping.
     """
-    # Build ID mapping for all IDs in imported state
-    all_ids: set[int] = set()
-    for tid in imported.tasks:
-        all_ids.add(int(tid))
-    for b in imported.blocked:
-        all_ids.add(b.id)
-    for h in imported.history:
-        all_ids.add(h.id)
-
-    id_map: dict[int, int] = {}
-    next_id = start_id
-    for old_id in sorted(all_ids):
-        id_map[old_id] = next_id
-        next_id += 1
-
-    # Remap tasks
-    new_tasks: dict[str, Task] = {}
-    for tid, task in imported.tasks.items():
-        new_id = id_map[int(tid)]
-        new_tasks[str(new_id)] = Task(
-            id=new_id,
-            title=task.title,
-            active=task.active,
-            created_at=task.created_at,
-        )
-
-    # Remap edges
-    new_edges: list[Edge] = []
-    for edge in imported.edges:
-        if edge.from_id in id_map and edge.to_id in id_map:
-            new_edges.append(Edge(
-                from_id=id_map[edge.from_id],
-                to_id=id_map[edge.to_id],
-            ))
-
-    # Remap blocked tasks
-    new_blocked: list[BlockedTask] = []
-    for b in imported.blocked:
-        new_id = id_map[b.id]
-        new_blocked.append(BlockedTask(
-            id=new_id,
-            title=b.title,
-            blocker=b.blocker,
-            created_at=b.created_at,
-        ))
-
-    # Remap history
-    new_history: list[HistoryEntry] = []
-    for h in imported.history:
-        new_id = id_map[h.id]
-        new_history.append(HistoryEntry(
-            id=new_id,
-            title=h.title,
-            completed_at=h.completed_at,
-            created_at=h.created_at,
-        ))
+    # Assign new IDs in the order they first appear: tasks, blocked, history
+    all_ids = dict.fromkeys(chain(
+        imported.tasks,
+        (b.id for b in imported.blocked),
+        (h.id for h in imported.history),
+    ))
+    id_map = {old_id: new_id for new_id, old_id in enumerate(all_ids, start_id)}
+    next_id = start_id + len(id_map)
+
+    new_tasks = {
+        id_map[tid]: Task(id=id_map[tid], title=t.title, active=t.active, created_at=t.created_at)
+        for tid, t in imported.tasks.items()
+    }
+    new_edges = [
+        Edge(from_id=id_map[e.from_id], to_id=id_map[e.to_id])
+        for e in imported.edges
+        if e.from_id in id_map and e.to_id in id_map
+    ]
+    new_blocked = [
+        BlockedTask(id=id_map[b.id], title=b.title, blocker=b.blocker, created_at=b.created_at)
+        for b in imported.blocked
+    ]
+    new_history = [
+        HistoryEntry(id=id_map[h.id], title=h.title, completed_at=h.completed_at, created_at=h.created_at)
+        for h in imported.history
+    ]
 
     remapped = State(
         tasks=new_tasks,
@@ -649,12 +634,12 @@ def load(file: str, merge: bool):
     path = Path(file)
 
     try:
-        data = json.loads(path.read_text())
+        data = decode_json(path.read_bytes())
         imported_state = State.from_dict(data)
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         click.echo(f"Error: Invalid JSON in {file}: {e}", err=True)
         return
-    except (KeyError, TypeError) as e:
+    except (KeyError, TypeError, ValueError) as e:
         click.echo(f"Error: Invalid state format in {file}: {e}", err=True)
         return
 
@@ -665,10 +650,12 @@ def load(file: str, merge: bool):
         remapped, id_map = _remap_state(imported_state, current_state.next_id)
 
         # Merge into current state
-        current_state.tasks.update(remapped.tasks)
-        current_state.edges.extend(remapped.edges)
-        current_state.blocked.extend(remapped.blocked)
-        current_state.history.extend(remapped.history)
+        current_state.add_task(*remapped.tasks.values())
+        for edge in remapped.edges:
+            current_state.add_edge(edge.from_id, edge.to_id)
+        current_state.add_blocked(*remapped.blocked)
+        for entry in remapped.history:
+            current_state.add_history(entry)
         current_state.next_id = remapped.next_id
 
         save_state(current_state)
@@ -708,10 +695,9 @@ def share(disable: bool, show_status: bool, refresh: bool):
         check_gh_auth,
         create_gist,
         delete_gist,
-        remove_gist_file,
         update_gist,
     )
-    from .render_md import render_state_md
+    from .render_md import content_digest, render_state_md
 
     state = load_state()
 
@@ -737,6 +723,7 @@ def share(disable: bool, show_status: bool, refresh: bool):
         state.config.share.enabled = False
         state.config.share.gist_id = None
         state.config.share.gist_url = None
+        state.config.share.content_hash = None
         save_state(state)
         click.echo("Sharing disabled")
         return
@@ -746,13 +733,15 @@ def share(disable: bool, show_status: bool, refresh: bool):
             click.echo("Sharing is not enabled. Run 'wip share' first.", err=True)
             return
 
-        # Clean up old HTML file if it exists
-        remove_gist_file(state.config.share.gist_id, "wip.html")
-
+        # Clean up old HTML file if it exists, in the same request
         md = render_state_md(state)
-        result = update_gist(state.config.share.gist_id, "wip.md", md)
+        result = update_gist(
+            state.config.share.gist_id, "wip.md", md, remove_files=("wip.html",)
+        )
 
         if result.success:
+            state.config.share.content_hash = content_digest(md)
+            save_state(state, skip_publish=True)
             click.echo(f"Updated: {state.config.share.gist_url}")
         else:
             click.echo(f"Error: {result.error}", err=True)
@@ -785,6 +774,7 @@ def share(disable: bool, show_status: bool, refresh: bool):
     state.config.share.enabled = True
     state.config.share.gist_id = result.gist_id
     state.config.share.gist_url = result.gist_url
+    state.config.share.content_hash = content_digest(md)
     save_state(state, skip_publish=True)  # Gist already has content
 
     click.echo("Sharing enabled!")
@@ -1,7 +1,34 @@
 """GitHub Gist integration for sharing WIP state."""
 
+import functools
+import gzip
+import http.client
+import os
+import random
+import re
 import subprocess
+import time
 from dataclasses import dataclass
+from typing import Any
+
+from .storage import decode_json, encode_json
+
+API_HOST = "api.github.com"
+
+# Retry transient failures (timeouts, rate limits, 5xx) with exponential backoff
+MAX_RETRIES = 2
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+# Retries stop once they would run past this many seconds in total. The
+# background publish thread is non-daemon, so this bounds how long a save
+# that auto-publishes can keep `wip` from exiting on a dead network.
+RETRY_DEADLINE = 20.0
+
+# Status codes worth retrying, as reported by gh ("... (HTTP 502)") or by us
+_TRANSIENT_STATUS = re.compile(r"HTTP (429|5\d\d)")
+
+# Reused HTTPS connection for token-based API calls (keep-alive)
+_connection: http.client.HTTPSConnection | None = None
 
 
 @dataclass
@@ -14,11 +41,156 @@ class GistResult:
     error: str | None = None
 
 
+def _env_token() -> str | None:
+    """Get a GitHub token from the environment, as gh itself would."""
+    return os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+
+
+class _TransientError(Exception):
+    """A failed API call that may succeed if retried."""
+
+    def __init__(self, message: str, status: int, retry_after: float | None = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _retry_delay(attempt: int, retry_after: float | None = None) -> float:
+    """Backoff before retry number attempt (0-based), with jitter."""
+    if retry_after is not None:
+        return min(retry_after, RETRY_MAX_DELAY)
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)
+    return delay * (1 + random.random() * 0.5)
+
+
+def _api(method: str, path: str, payload: dict[str, Any] | None, timeout: float) -> tuple[bool, str]:
+    """Call the GitHub REST API, retrying transient failures.
+
+    POST is not idempotent (a retried create could make a second gist), so it
+    is only retried on rate limiting, where GitHub did not process the call.
+
+    Retries (backoff included) finish within RETRY_DEADLINE of the first
+    call; a retry's timeout is cut to the time left.
+
+    Returns (ok, body) where body is the response text on success and the
+    error message on failure. Timeouts that persist after the last retry are
+    raised.
+    """
+    start = time.monotonic()
+    attempt_timeout = timeout
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return _api_once(method, path, payload, attempt_timeout)
+        except (_TransientError, subprocess.TimeoutExpired, TimeoutError, ConnectionError) as e:
+            retryable = method != "POST" or getattr(e, "status", None) == 429
+            delay = _retry_delay(attempt, getattr(e, "retry_after", None))
+            remaining = RETRY_DEADLINE - (time.monotonic() - start) - delay
+            if attempt == MAX_RETRIES or not retryable or remaining <= 0:
+                if isinstance(e, _TransientError):
+                    return False, str(e)
+                raise
+            time.sleep(delay)
+            attempt_timeout = min(timeout, remaining)
+    raise AssertionError("unreachable")
+
+
+def _api_once(
+    method: str, path: str, payload: dict[str, Any] | None, timeout: float
+) -> tuple[bool, str]:
+    """Make a single GitHub REST API call.
+
+    Talks HTTPS directly when a token is set in the environment, which avoids
+    starting a gh process per call. Otherwise goes through `gh api`, which
+    uses gh's stored credentials.
+
+    Raises _TransientError for rate limits and server errors.
+    """
+    body = encode_json(payload) if payload is not None else None
+    token = _env_token()
+    if token:
+        return _http_api(token, method, path, body, timeout)
+
+    args = ["gh", "api", "--method", method, path]
+    if body is not None:
+        args += ["--input", "-"]
+    # Pipe the already-encoded bytes; no text-mode re-encoding on the way in
+    result = subprocess.run(
+        args,
+        input=body,
+        capture_output=True,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        error = result.stderr.decode(errors="replace").strip()
+        match = _TRANSIENT_STATUS.search(error)
+        if match:
+            raise _TransientError(error, int(match.group(1)))
+        return False, error
+    return True, result.stdout.decode()
+
+
+def _http_api(
+    token: str, method: str, path: str, body: bytes | None, timeout: float
+) -> tuple[bool, str]:
+    """Call the GitHub REST API over a reused HTTPS connection."""
+    global _connection
+    if _connection is None:
+        _connection = http.client.HTTPSConnection(API_HOST, timeout=timeout)
+    _connection.timeout = timeout
+    if _connection.sock is not None:
+        _connection.sock.settimeout(timeout)
+
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "Accept-Encoding": "gzip",
+        "Authorization": f"Bearer {token}",
+        "User-Agent": "wip",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    if body is not None:
+        headers["Content-Type"] = "application/json"
+
+    try:
+        _connection.request(method, path, body=body, headers=headers)
+        response = _connection.getresponse()
+        raw = response.read()
+        # Gist responses echo back every file's content, so they compress well
+        if response.getheader("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        text = raw.decode()
+    except (http.client.HTTPException, OSError):
+        # Drop the connection so the next call starts fresh
+        _connection.close()
+        _connection = None
+        raise
+
+    if response.status >= 400:
+        try:
+            message = decode_json(text).get("message")
+        except (ValueError, AttributeError):
+            message = None
+        error = f"HTTP {response.status}: {message or response.reason}"
+        if response.status == 429 or response.status >= 500:
+            retry_after = response.getheader("Retry-After")
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else None
+            raise _TransientError(error, response.status, delay)
+        return False, error
+    return True, text
+
+
 def check_gh_auth() -> tuple[bool, str | None]:
     """Check if gh CLI is authenticated.
 
     Returns (is_authenticated, error_message).
     """
+    if _env_token():
+        return True, None
+    return _gh_auth_status()
+
+
+@functools.lru_cache(maxsize=1)
+def _gh_auth_status() -> tuple[bool, str | None]:
+    """Run `gh auth status` once per process."""
     try:
         result = subprocess.run(
             ["gh", "auth", "status"],
@@ -45,30 +217,19 @@ def create_gist(filename: str, content: str, description: str = "") -> GistResul
         GistResult with success status and gist URL/ID
     """
     try:
-        import json as json_module
-
-        # Use GitHub API directly for consistent behavior
         payload = {
             "description": description,
             "public": False,
             "files": {filename: {"content": content}},
         }
 
-        result = subprocess.run(
-            ["gh", "api", "--method", "POST", "/gists", "--input", "-"],
-            input=json_module.dumps(payload),
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        ok, body = _api("POST", "/gists", payload, timeout=30)
 
-        if result.returncode != 0:
-            return GistResult(
-                success=False, error=result.stderr.strip() or "Failed to create gist"
-            )
+        if not ok:
+            return GistResult(success=False, error=body or "Failed to create gist")
 
         # Parse response to get gist ID and URL
-        response = json_module.loads(result.stdout)
+        response = decode_json(body)
         gist_id = response.get("id")
         gist_url = response.get("html_url")
 
@@ -76,57 +237,50 @@ def create_gist(filename: str, content: str, description: str = "") -> GistResul
 
     except FileNotFoundError:
         return GistResult(success=False, error="gh CLI not installed")
-    except subprocess.TimeoutExpired:
+    except (subprocess.TimeoutExpired, TimeoutError):
         return GistResult(success=False, error="Gist creation timed out")
     except Exception as e:
         return GistResult(success=False, error=str(e))
 
 
-def update_gist(gist_id: str, filename: str, content: str) -> GistResult:
+def update_gist(
+    gist_id: str, filename: str, content: str, remove_files: tuple[str, ...] = ()
+) -> GistResult:
     """Update an existing gist with new content.
 
     Args:
         gist_id: The gist ID to update
         filename: Name of the file to update
         content: New file content
+        remove_files: Other files to delete in the same request, if present
 
     Returns:
         GistResult with success status
     """
     try:
-        import json as json_module
+        files: dict[str, Any] = dict.fromkeys(remove_files)
+        files[filename] = {"content": content}
+        payload = {"files": files}
 
-        # Use GitHub API directly - faster and more reliable than gh gist edit
-        payload = {"files": {filename: {"content": content}}}
+        ok, body = _api("PATCH", f"/gists/{gist_id}", payload, timeout=15)
 
-        result = subprocess.run(
-            [
-                "gh",
-                "api",
-                "--method",
-                "PATCH",
-                f"/gists/{gist_id}",
-                "--input",
-                "-",
-            ],
-            input=json_module.dumps(payload),
-            capture_output=True,
-            text=True,
-            timeout=15,
-        )
+        if not ok and remove_files and "HTTP 422" in body:
+            # Removing a file the gist doesn't have fails validation; retry
+            # with just the update. Other errors would fail again.
+            return update_gist(gist_id, filename, content)
 
-        if result.returncode != 0:
+        if not ok:
             return GistResult(
                 success=False,
                 gist_id=gist_id,
-                error=result.stderr.strip() or "Failed to update gist",
+                error=body or "Failed to update gist",
             )
 
         return GistResult(success=True, gist_id=gist_id)
 
     except FileNotFoundError:
         return GistResult(success=False, error="gh CLI not installed")
-    except subprocess.TimeoutExpired:
+    except (subprocess.TimeoutExpired, TimeoutError):
         return GistResult(success=False, error="Gist update timed out")
     except Exception as e:
         return GistResult(success=False, error=str(e))
@@ -143,26 +297,10 @@ def remove_gist_file(gist_id: str, filename: str) -> GistResult:
         GistResult with success status
     """
     try:
-        import json as json_module
-
-        # Use GitHub API - set file content to null to delete it
+        # Set file content to null to delete it
         payload = {"files": {filename: None}}
 
-        subprocess.run(
-            [
-                "gh",
-                "api",
-                "--method",
-                "PATCH",
-                f"/gists/{gist_id}",
-                "--input",
-                "-",
-            ],
-            input=json_module.dumps(payload),
-            capture_output=True,
-            text=True,
-            timeout=15,
-        )
+        _api("PATCH", f"/gists/{gist_id}", payload, timeout=15)
 
         # Ignore errors - file might not exist
         return GistResult(success=True, gist_id=gist_id)
@@ -181,23 +319,16 @@ def delete_gist(gist_id: str) -> GistResult:
         GistResult with success status
     """
     try:
-        result = subprocess.run(
-            ["gh", "gist", "delete", gist_id, "--yes"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        ok, body = _api("DELETE", f"/gists/{gist_id}", None, timeout=30)
 
-        if result.returncode != 0:
-            return GistResult(
-                success=False, error=result.stderr.strip() or "Failed to delete gist"
-            )
+        if not ok:
+            return GistResult(success=False, error=body or "Failed to delete gist")
 
         return GistResult(success=True)
 
     except FileNotFoundError:
         return GistResult(success=False, error="gh CLI not installed")
-    except subprocess.TimeoutExpired:
+    except (subprocess.TimeoutExpired, TimeoutError):
         return GistResult(success=False, error="Gist deletion timed out")
     except Exception as e:
         return GistResult(success=False, error=str(e))
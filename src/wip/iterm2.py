@@ -1,12 +1,14 @@
 """iTerm2 inline image support for terminal rendering."""
 
 import base64
+import functools
 import os
 import sys
-from pathlib import Path
+from importlib.resources import files
+from importlib.resources.abc import Traversable
 
-# Get the assets directory path
-ASSETS_DIR = Path(__file__).parent / "assets"
+# Packaged assets directory (works from a wheel or zip as well as a checkout)
+ASSETS_DIR = files("wip") / "assets"
 
 # Bufo image mappings for different task states
 BUFO_IMAGES = {
@@ -27,15 +29,31 @@ FALLBACK_EMOJI = {
 }
 
 
+def _detect_iterm2() -> bool:
+    return os.environ.get("TERM_PROGRAM", "") == "iTerm.app"
+
+
+# The terminal can't change within a process, so detect it once
+_IS_ITERM2 = _detect_iterm2()
+
+
+def _refresh_iterm2_detection() -> None:
+    """Re-read TERM_PROGRAM, e.g. after changing it in tests."""
+    global _IS_ITERM2
+    _IS_ITERM2 = _detect_iterm2()
+
+
 def is_iterm2() -> bool:
     """Check if we're running in iTerm2."""
-    term_program = os.environ.get("TERM_PROGRAM", "")
-    return term_program == "iTerm.app"
+    return _IS_ITERM2
 
 
-def inline_image_escape(image_path: Path, width: int = 2, height: int = 1) -> str:
+@functools.lru_cache(maxsize=32)
+def inline_image_escape(image_path: Traversable, width: int = 2, height: int = 1) -> str:
     """Generate iTerm2 inline image escape sequence.
 
+    Cached, since the same few images are drawn on every row.
+
     Args:
         image_path: Path to the image file
         width: Width in terminal cells
@@ -44,11 +62,11 @@ def inline_image_escape(image_path: Path, width: int = 2, height: int = 1) -> st
     Returns:
         Escape sequence string that displays the image inline
     """
-    if not image_path.exists():
-        return ""
-
     # Read and base64 encode the image
-    image_data = image_path.read_bytes()
+    try:
+        image_data = image_path.read_bytes()
+    except FileNotFoundError:
+        return ""
     encoded = base64.b64encode(image_data).decode("ascii")
 
     # Build iTerm2 inline image escape sequence
@@ -75,15 +93,18 @@ def get_bufo_str(state: str, width: int = 2, height: int = 1) -> str:
     """
     if not is_iterm2():
         return FALLBACK_EMOJI.get(state, "")
+    return _bufo_escape(state, width, height)
+
 
+@functools.lru_cache(maxsize=32)
+def _bufo_escape(state: str, width: int, height: int) -> str:
+    """Resolve a state to its ready-to-print image string, once per state."""
     image_name = BUFO_IMAGES.get(state)
     if not image_name:
         return FALLBACK_EMOJI.get(state, "")
 
-    image_path = ASSETS_DIR / image_name
-    if image_path.exists():
-        return inline_image_escape(image_path, width, height)
-    return FALLBACK_EMOJI.get(state, "")
+    escape = inline_image_escape(ASSETS_DIR / image_name, width, height)
+    return escape or FALLBACK_EMOJI.get(state, "")
 
 
 def bufo(state: str) -> str:
@@ -1,11 +1,18 @@
 """Data model classes for WIP task tracker."""
 
+import functools
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, NamedTuple
 
+# Renderers read the *_datetime properties repeatedly. datetimes are immutable,
+# so cache one parse per distinct string (unlike cached_property, this also
+# works for slotted classes). Bounded so long-lived importers don't grow it
+# without limit.
+_parse_iso = functools.lru_cache(maxsize=4096)(datetime.fromisoformat)
 
-@dataclass
+
+@dataclass(slots=True)
 class Task:
     """A task in the task pool."""
 
@@ -38,12 +45,14 @@ class Task:
         """Get created_at as datetime object."""
         if not self.created_at:
             return None
-        return datetime.fromisoformat(self.created_at)
+        return _parse_iso(self.created_at)
+
 
+class Edge(NamedTuple):
+    """A dependency edge between tasks.
 
-@dataclass
-class Edge:
-    """A dependency edge between tasks."""
+    A plain tuple underneath, so edges are compact, hashable and compared in C.
+    """
 
     from_id: int
     to_id: int
@@ -58,7 +67,7 @@ class Edge:
         return cls(from_id=data["from"], to_id=data["to"])
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockedTask:
     """A task blocked by an external dependency."""
 
@@ -91,10 +100,10 @@ class BlockedTask:
         """Get created_at as datetime object."""
         if not self.created_at:
             return None
-        return datetime.fromisoformat(self.created_at)
+        return _parse_iso(self.created_at)
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoryEntry:
     """A completed task in history."""
 
@@ -125,23 +134,24 @@ class HistoryEntry:
     @property
     def completed_datetime(self) -> datetime:
         """Parse completed_at as datetime."""
-        return datetime.fromisoformat(self.completed_at)
+        return _parse_iso(self.completed_at)
 
     @property
     def created_datetime(self) -> datetime | None:
         """Parse created_at as datetime."""
         if not self.created_at:
             return None
-        return datetime.fromisoformat(self.created_at)
+        return _parse_iso(self.created_at)
 
 
-@dataclass
+@dataclass(slots=True)
 class ShareConfig:
     """Sharing configuration for GitHub Gist."""
 
     enabled: bool = False
     gist_id: str | None = None
     gist_url: str | None = None
+    content_hash: str | None = None  # Digest of the last published content
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -149,6 +159,7 @@ class ShareConfig:
             "enabled": self.enabled,
             "gist_id": self.gist_id,
             "gist_url": self.gist_url,
+            "content_hash": self.content_hash,
         }
 
     @classmethod
@@ -158,10 +169,11 @@ class ShareConfig:
             enabled=data.get("enabled", False),
             gist_id=data.get("gist_id"),
             gist_url=data.get("gist_url"),
+            content_hash=data.get("content_hash"),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Configuration settings."""
 
@@ -187,21 +199,36 @@ class Config:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class State:
     """Complete application state."""
 
-    tasks: dict[str, Task] = field(default_factory=dict)
+    tasks: dict[int, Task] = field(default_factory=dict)
     edges: list[Edge] = field(default_factory=list)
     blocked: list[BlockedTask] = field(default_factory=list)
     history: list[HistoryEntry] = field(default_factory=list)
     next_id: int = 1
     config: Config = field(default_factory=Config)
+    _adjacency: dict[int, list[int]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _reverse_adjacency: dict[int, list[int]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _blocked_index: dict[int, BlockedTask] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _history_index: dict[int, HistoryEntry] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _active_ids: set[int] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
-            "tasks": {k: v.to_dict() for k, v in self.tasks.items()},
+            "tasks": {str(k): v.to_dict() for k, v in self.tasks.items()},
             "edges": [e.to_dict() for e in self.edges],
             "blocked": [b.to_dict() for b in self.blocked],
             "history": [h.to_dict() for h in self.history],
@@ -212,7 +239,8 @@ class State:
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "State":
         """Create from dictionary."""
-        tasks = {k: Task.from_dict(v) for k, v in data.get("tasks", {}).items()}
+        # JSON object keys are strings; tasks are keyed by int in memory
+        tasks = {int(k): Task.from_dict(v) for k, v in data.get("tasks", {}).items()}
         edges = [Edge.from_dict(e) for e in data.get("edges", [])]
         blocked = [BlockedTask.from_dict(b) for b in data.get("blocked", [])]
         history = [HistoryEntry.from_dict(h) for h in data.get("history", [])]
@@ -229,27 +257,148 @@ class State:
 
     def get_task(self, task_id: int) -> Task | None:
         """Get a task by ID."""
-        return self.tasks.get(str(task_id))
+        return self.tasks.get(task_id)
+
+    def add_task(self, *tasks: Task) -> None:
+        """Add one or more tasks."""
+        for task in tasks:
+            self.tasks[task.id] = task
+            if task.active and self._active_ids is not None:
+                self._active_ids.add(task.id)
+
+    def remove_task(self, task_id: int) -> Task | None:
+        """Remove a task by ID. Returns the removed task, if any."""
+        task = self.tasks.pop(task_id, None)
+        if self._active_ids is not None:
+            self._active_ids.discard(task_id)
+        return task
+
+    def set_active(self, task: Task, active: bool) -> None:
+        """Mark a task active or inactive."""
+        task.active = active
+        if self._active_ids is not None:
+            if active:
+                self._active_ids.add(task.id)
+            else:
+                self._active_ids.discard(task.id)
 
     def get_blocked(self, task_id: int) -> BlockedTask | None:
         """Get a blocked task by ID."""
-        for b in self.blocked:
-            if b.id == task_id:
-                return b
-        return None
+        if self._blocked_index is None:
+            self._blocked_index = {b.id: b for b in self.blocked}
+        return self._blocked_index.get(task_id)
+
+    def add_blocked(self, *blocked: BlockedTask) -> None:
+        """Add one or more blocked tasks."""
+        self.blocked.extend(blocked)
+        if self._blocked_index is not None:
+            self._blocked_index.update((b.id, b) for b in blocked)
+
+    def remove_blocked(self, task_id: int) -> BlockedTask | None:
+        """Remove a blocked task by ID. Returns the removed task, if any."""
+        blocked = self.get_blocked(task_id)
+        if blocked is not None:
+            self.blocked.remove(blocked)
+            del self._blocked_index[task_id]
+        return blocked
+
+    def get_history(self, task_id: int) -> HistoryEntry | None:
+        """Get a history entry by ID."""
+        if self._history_index is None:
+            self._history_index = {h.id: h for h in self.history}
+        return self._history_index.get(task_id)
+
+    def add_history(self, entry: HistoryEntry) -> None:
+        """Add a completed task to history."""
+        self.history.append(entry)
+        if self._history_index is not None:
+            self._history_index[entry.id] = entry
+
+    def remove_history(self, task_id: int) -> HistoryEntry | None:
+        """Remove a history entry by ID. Returns the removed entry, if any."""
+        entry = self.get_history(task_id)
+        if entry is not None:
+            self.history.remove(entry)
+            del self._history_index[task_id]
+        return entry
 
     def active_count(self) -> int:
         """Count currently active tasks."""
-        return sum(1 for t in self.tasks.values() if t.active)
+        if self._active_ids is None:
+            self._active_ids = {t.id for t in self.tasks.values() if t.active}
+        return len(self._active_ids)
 
     def has_edge(self, from_id: int, to_id: int) -> bool:
         """Check if an edge exists."""
-        return any(e.from_id == from_id and e.to_id == to_id for e in self.edges)
+        return to_id in self.get_adjacency().get(from_id, ())
 
     def get_edges_from(self, task_id: int) -> list[Edge]:
         """Get all edges starting from a task."""
-        return [e for e in self.edges if e.from_id == task_id]
+        return [Edge(from_id=task_id, to_id=t) for t in self.get_adjacency().get(task_id, ())]
 
     def get_edges_to(self, task_id: int) -> list[Edge]:
         """Get all edges ending at a task."""
-        return [e for e in self.edges if e.to_id == task_id]
+        return [Edge(from_id=f, to_id=task_id) for f in self.get_reverse_adjacency().get(task_id, ())]
+
+    def get_adjacency(self) -> dict[int, list[int]]:
+        """Get a mapping from task ID to the IDs of tasks that depend on it.
+
+        Built once from the edge list and cached. Mutate edges through
+        add_edge/remove_edge/remove_task_edges so the cache stays valid.
+        """
+        if self._adjacency is None:
+            self._build_edge_index()
+        return self._adjacency
+
+    def get_reverse_adjacency(self) -> dict[int, list[int]]:
+        """Get a mapping from task ID to the IDs of tasks it depends on."""
+        if self._reverse_adjacency is None:
+            self._build_edge_index()
+        return self._reverse_adjacency
+
+    def _build_edge_index(self) -> None:
+        """Build both adjacency maps in one pass over the edges."""
+        adj: dict[int, list[int]] = {}
+        rev: dict[int, list[int]] = {}
+        for e in self.edges:
+            adj.setdefault(e.from_id, []).append(e.to_id)
+            rev.setdefault(e.to_id, []).append(e.from_id)
+        self._adjacency = adj
+        self._reverse_adjacency = rev
+
+    def add_edge(self, from_id: int, to_id: int) -> None:
+        """Add a dependency edge."""
+        self.edges.append(Edge(from_id=from_id, to_id=to_id))
+        if self._adjacency is not None:
+            self._adjacency.setdefault(from_id, []).append(to_id)
+            self._reverse_adjacency.setdefault(to_id, []).append(from_id)
+
+    def remove_edge(self, from_id: int, to_id: int) -> None:
+        """Remove a dependency edge."""
+        if not self.has_edge(from_id, to_id):
+            return
+        self.edges.remove(Edge(from_id, to_id))
+        self._unindex_edge(from_id, to_id)
+
+    def remove_task_edges(self, task_id: int) -> None:
+        """Remove all edges starting or ending at a task."""
+        children = self.get_adjacency().get(task_id, [])
+        parents = self.get_reverse_adjacency().get(task_id, [])
+        if not children and not parents:
+            return
+        self.edges[:] = [e for e in self.edges if e.from_id != task_id and e.to_id != task_id]
+        for child_id in children[:]:
+            self._unindex_edge(task_id, child_id)
+        for parent_id in parents[:]:
+            self._unindex_edge(parent_id, task_id)
+
+    def _unindex_edge(self, from_id: int, to_id: int) -> None:
+        """Drop an edge from both adjacency maps."""
+        for index, key, value in (
+            (self._adjacency, from_id, to_id),
+            (self._reverse_adjacency, to_id, from_id),
+        ):
+            ids = index[key]
+            ids.remove(value)
+            if not ids:
+                del index[key]
@@ -1,12 +1,12 @@
-"""Rendering utilities for WIP CLI output."""
+"""Rendering utilities for WIP CLI output.
+
+Rich is imported inside the Rich renderers only, so the plain-text
+*_simple renderers don't pay for importing it.
+"""
 
 import sys
 from datetime import datetime
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-
 from .iterm2 import bufo, is_iterm2
 from .model import BlockedTask, HistoryEntry, State, Task
 
@@ -22,8 +22,17 @@ class Colors:
     BLUE = "\033[34m"
 
 
+def _write_section(header: str, lines: list[str]) -> None:
+    """Write a section header and its lines to stdout in a single write."""
+    sys.stdout.write("".join([f"\n{header}\n", *(line + "\n" for line in lines)]))
+    sys.stdout.flush()
+
+
 def render_history_table(entries: list[HistoryEntry]) -> None:
     """Render completed tasks as a table."""
+    from rich.console import Console
+    from rich.table import Table
+
     console = Console()
 
     table = Table(title="COMPLETED TASKS", show_header=True, header_style="bold")
@@ -42,11 +51,15 @@ def render_history_table(entries: list[HistoryEntry]) -> None:
 
 def render_recent_history(entries: list[HistoryEntry]) -> None:
     """Render recently completed tasks."""
+    from rich.console import Console
+    from rich.panel import Panel
+
     console = Console()
 
+    done = bufo("done")
     lines = []
     for entry in entries:
-        lines.append(f"{bufo('done')} {entry.title}")
+        lines.append(f"{done} {entry.title}")
 
     count = len(entries)
     content = "\n".join(lines)
@@ -64,26 +77,27 @@ def render_recent_history_simple(entries: list[HistoryEntry]) -> None:
     c = Colors
     count = len(entries)
 
-    print(f"\n{c.BOLD}{c.GREEN}── Recent History ({count} task{'s' if count != 1 else ''}) ──{c.RESET}\n")
-
-    for entry in entries:
-        sys.stdout.write(f"  {bufo('done')} {entry.title}\n")
-    sys.stdout.flush()
-    print()
+    done = bufo("done")
+    lines = ["", *(f"  {done} {entry.title}" for entry in entries), ""]
+    _write_section(f"{c.BOLD}{c.GREEN}── Recent History ({count} task{'s' if count != 1 else ''}) ──{c.RESET}", lines)
 
 
 def render_stale_tasks(tasks: list[Task], blocked: list[BlockedTask], stale_days: int) -> None:
     """Render stale tasks."""
+    from rich.console import Console
+    from rich.panel import Panel
+
     console = Console()
 
+    stale, hold = bufo("stale"), bufo("hold")
     lines = []
     for task in sorted(tasks, key=lambda t: t.created_at or ""):
         created = task.created_at[:10] if task.created_at else "unknown"
-        lines.append(f"{bufo('stale')} [cyan][{task.id}][/cyan] {task.title} [dim](created {created})[/dim]")
+        lines.append(f"{stale} [cyan][{task.id}][/cyan] {task.title} [dim](created {created})[/dim]")
 
     for b in sorted(blocked, key=lambda t: t.created_at or ""):
         created = b.created_at[:10] if b.created_at else "unknown"
-        lines.append(f"{bufo('hold')} [cyan][{b.id}][/cyan] {b.title} [dim](created {created}, {b.blocker})[/dim]")
+        lines.append(f"{hold} [cyan][{b.id}][/cyan] {b.title} [dim](created {created}, {b.blocker})[/dim]")
 
     content = "\n".join(lines)
     count = len(tasks) + len(blocked)
@@ -95,20 +109,57 @@ def render_stale_tasks(tasks: list[Task], blocked: list[BlockedTask], stale_days
     console.print(panel)
 
 
+def _wrap_text(text: str, width: int) -> list[str]:
+    """Wrap text into lines of at most width, breaking at spaces where possible.
+
+    Walks break positions in the original string instead of re-slicing the
+    remainder on every line.
+    """
+    n = len(text)
+    if n <= width:
+        return [text]
+    lines = []
+    start = 0
+    while start < n:
+        if n - start <= width:
+            lines.append(text[start:])
+            break
+        # Find a good break point
+        break_at = start + width
+        space_idx = text.rfind(" ", start, break_at)
+        if space_idx > start:
+            break_at = space_idx
+        lines.append(text[start:break_at].rstrip())
+        # Skip whitespace at the start of the next line
+        start = break_at
+        while start < n and text[start].isspace():
+            start += 1
+    return lines
+
+
+def _tasks_by_weekday(entries: list[HistoryEntry]) -> list[list[str]]:
+    """Group completed task titles by weekday (0=Mon, 4=Fri), dropping weekends."""
+    tasks_by_day: list[list[str]] = [[] for _ in range(5)]
+    appenders = [day.append for day in tasks_by_day]
+    for entry in entries:
+        day_idx = entry.completed_datetime.weekday()
+        if day_idx < 5:
+            appenders[day_idx](entry.title)
+    return tasks_by_day
+
+
 def render_weekly_table(entries: list[HistoryEntry], monday: datetime, sunday: datetime) -> None:
     """Render weekly completed tasks as a table with weekdays as columns."""
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.table import Table
+
     console = Console()
 
     week_range = f"Week of {monday.strftime('%b %d')} - {sunday.strftime('%b %d, %Y')}"
 
-    # Group tasks by weekday (0=Mon, 4=Fri) - weekdays only
     day_names = ["Mon", "Tue", "Wed", "Thu", "Fri"]
-    tasks_by_day: dict[int, list[str]] = {i: [] for i in range(5)}
-
-    for entry in entries:
-        day_idx = entry.completed_datetime.weekday()
-        if day_idx < 5:  # Only include weekdays
-            tasks_by_day[day_idx].append(entry.title)
+    tasks_by_day = _tasks_by_weekday(entries)
 
     # Find max tasks in any day for row count
     max_tasks = max((len(tasks_by_day[i]) for i in range(5)), default=0)
@@ -117,38 +168,22 @@ def render_weekly_table(entries: list[HistoryEntry], monday: datetime, sunday: d
         console.print("[dim]No tasks completed on weekdays this week.[/dim]")
         return
 
-    # Wrap text helper - wraps text to fit within max_width
+    # Wrap titles to fit within max_width
     max_width = 16
 
-    def wrap_text(text: str) -> str:
-        if len(text) <= max_width:
-            return text
-        lines = []
-        while text:
-            if len(text) <= max_width:
-                lines.append(text)
-                break
-            # Find a good break point
-            break_at = max_width
-            space_idx = text.rfind(" ", 0, max_width)
-            if space_idx > 0:
-                break_at = space_idx
-            lines.append(text[:break_at].rstrip())
-            text = text[break_at:].lstrip()
-        return "\n".join(lines)
-
     table = Table(show_header=True, header_style="bold cyan", box=None, padding=(0, 1), expand=False)
     for day_idx in range(5):
         table.add_column(day_names[day_idx], justify="left", vertical="top")
 
     # Add rows - use bufo fallback emoji for done tasks
+    done = bufo("done")
     for row_idx in range(max_tasks):
         row = []
         for day_idx in range(5):
             tasks = tasks_by_day[day_idx]
             if row_idx < len(tasks):
-                wrapped = wrap_text(tasks[row_idx])
-                row.append(f"{bufo('done')} {wrapped}")
+                wrapped = "\n".join(_wrap_text(tasks[row_idx], max_width))
+                row.append(f"{done} {wrapped}")
             else:
                 row.append("")
         table.add_row(*row)
@@ -170,14 +205,8 @@ def render_weekly_simple(entries: list[HistoryEntry], monday: datetime, sunday:
     """Render weekly completed tasks with iTerm2 inline images."""
     week_range = f"Week of {monday.strftime('%b %d')} - {sunday.strftime('%b %d, %Y')}"
 
-    # Group tasks by weekday (0=Mon, 4=Fri) - weekdays only
     day_names = ["Mon", "Tue", "Wed", "Thu", "Fri"]
-    tasks_by_day: dict[int, list[str]] = {i: [] for i in range(5)}
-
-    for entry in entries:
-        day_idx = entry.completed_datetime.weekday()
-        if day_idx < 5:  # Only include weekdays
-            tasks_by_day[day_idx].append(entry.title)
+    tasks_by_day = _tasks_by_weekday(entries)
 
     # Find max tasks in any day for row count
     max_tasks = max((len(tasks_by_day[i]) for i in range(5)), default=0)
@@ -188,167 +217,154 @@ def render_weekly_simple(entries: list[HistoryEntry], monday: datetime, sunday:
 
     c = Colors
 
-    print(f"\n{c.BOLD}{c.GREEN}── {week_range} ──{c.RESET}\n")
+    out = [f"\n{c.BOLD}{c.GREEN}── {week_range} ──{c.RESET}\n\n"]
 
     # Calculate column widths
     col_width = 18
     text_width = col_width - 3  # Account for emoji
 
-    def wrap_text(text: str) -> list[str]:
-        """Wrap text into multiple lines."""
-        if len(text) <= text_width:
-            return [text]
-        lines = []
-        while text:
-            if len(text) <= text_width:
-                lines.append(text)
-                break
-            break_at = text_width
-            space_idx = text.rfind(" ", 0, text_width)
-            if space_idx > 0:
-                break_at = space_idx
-            lines.append(text[:break_at].rstrip())
-            text = text[break_at:].lstrip()
-        return lines
-
     # Print header
-    header = " ".join(f"{c.BOLD}{c.CYAN}{name:^{col_width}}{c.RESET}" for name in day_names)
-    sys.stdout.write(header + "\n")
-    sys.stdout.write("-" * (col_width * 5 + 4) + "\n")
+    bold_cyan, reset = c.BOLD + c.CYAN, c.RESET
+    header = " ".join([f"{bold_cyan}{name:^{col_width}}{reset}" for name in day_names])
+    out.append(header + "\n")
+    out.append("-" * (col_width * 5 + 4) + "\n")
 
-    # Build wrapped content for each day
-    wrapped_by_day: dict[int, list[list[str]]] = {i: [] for i in range(5)}
-    for day_idx in range(5):
-        for task in tasks_by_day[day_idx]:
-            wrapped_by_day[day_idx].append(wrap_text(task))
+    # Wrapped lines for each task, indexed [day][row]
+    wrapped = [[_wrap_text(task, text_width) for task in day] for day in tasks_by_day]
 
     # Print rows - need to handle multi-line cells
+    done = bufo("done")
+    blank = " " * col_width
     for row_idx in range(max_tasks):
+        cells = [day[row_idx] if row_idx < len(day) else () for day in wrapped]
         # Get max lines needed for this row
-        max_lines = 1
-        for day_idx in range(5):
-            if row_idx < len(wrapped_by_day[day_idx]):
-                max_lines = max(max_lines, len(wrapped_by_day[day_idx][row_idx]))
+        max_lines = max(1, *map(len, cells))
 
         # Print each line of this row
         for line_idx in range(max_lines):
             row_parts = []
-            for day_idx in range(5):
-                if row_idx < len(wrapped_by_day[day_idx]):
-                    lines = wrapped_by_day[day_idx][row_idx]
-                    if line_idx < len(lines):
-                        if line_idx == 0:
-                            text = f"{bufo('done')} {lines[line_idx]}"
-                        else:
-                            text = f"   {lines[line_idx]}"
-                        row_parts.append(f"{text:<{col_width}}")
+            for lines in cells:
+                if line_idx < len(lines):
+                    if line_idx == 0:
+                        text = f"{done} {lines[line_idx]}"
                     else:
-                        row_parts.append(" " * col_width)
+                        text = f"   {lines[line_idx]}"
+                    row_parts.append(text.ljust(col_width))
                 else:
-                    row_parts.append(" " * col_width)
-            sys.stdout.write(" ".join(row_parts) + "\n")
-    sys.stdout.flush()
+                    row_parts.append(blank)
+            out.append(" ".join(row_parts) + "\n")
 
     count = sum(len(tasks_by_day[i]) for i in range(5))
-    print(f"\n{c.DIM}Total: {count} task{'s' if count != 1 else ''} completed{c.RESET}\n")
+    out.append(f"\n{c.DIM}Total: {count} task{'s' if count != 1 else ''} completed{c.RESET}\n\n")
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
 
 
-def _build_dag_content(
+def _tree_lines(
     task_ids: set[int],
-    edges: list,
+    adjacency: dict[int, list[int]],
     format_task: callable,
     format_task_no_emoji: callable,
-) -> str:
-    """Build tree content for a set of tasks.
+) -> list[str]:
+    """Lay out a set of tasks as trees, one line per task.
 
-    Returns a string with tree structure for linked tasks and plain list for isolated tasks.
-    Root tasks and standalone tasks get emoji, child tasks don't.
+    Linked tasks are drawn as trees with box-drawing connectors, followed by
+    isolated tasks as a plain list. Root tasks and standalone tasks get emoji,
+    child tasks don't. adjacency is State.get_adjacency() for the whole state;
+    only links with both ends in task_ids are drawn.
     """
-    if not task_ids:
-        return ""
-
-    # Build adjacency maps for tasks in this set
-    children: dict[int, list[int]] = {tid: [] for tid in task_ids}
-    parents: dict[int, list[int]] = {tid: [] for tid in task_ids}
+    if not adjacency:
+        # Nothing is linked, so every task is a standalone line
+        return [format_task(tid) for tid in sorted(task_ids)]
 
-    for edge in edges:
-        # Only include edges where both endpoints are in our set
-        if edge.from_id in task_ids and edge.to_id in task_ids:
-            children[edge.from_id].append(edge.to_id)
-            parents[edge.to_id].append(edge.from_id)
+    # Restrict the shared adjacency map to tasks in this set, children in ID order
+    children = {tid: sorted(c for c in adjacency.get(tid, ()) if c in task_ids) for tid in task_ids}
+    has_parent = {c for tid in task_ids for c in children[tid]}
 
-    # Separate isolated tasks (no edges) from linked tasks
-    isolated_ids = [tid for tid in task_ids if not children[tid] and not parents[tid]]
-    linked_ids = task_ids - set(isolated_ids)
+    # Separate isolated tasks (no edges) from linked tasks, both in ID order
+    ordered = sorted(task_ids)
+    isolated_ids = [tid for tid in ordered if not children[tid] and tid not in has_parent]
+    linked_ids = [tid for tid in ordered if children[tid] or tid in has_parent]
 
     lines: list[str] = []
 
     # Build tree for linked tasks using manual formatting
     if linked_ids:
-        # Find root tasks (no parents within linked set)
-        roots = [tid for tid in linked_ids if not parents.get(tid, [])]
-        roots.sort()
-
+        # Find root tasks (no parents within linked set), then any unvisited
+        # linked tasks (handles cycles)
+        roots = [tid for tid in linked_ids if tid not in has_parent]
         visited: set[int] = set()
 
-        def add_lines(task_id: int, prefix: str = "", is_last: bool = True, depth: int = 0) -> None:
-            if task_id in visited or depth > 10:
-                return
-            visited.add(task_id)
-
-            task_children = sorted(children.get(task_id, []))
-
-            # Root tasks (depth 0) get emoji, children don't
-            formatter = format_task if depth == 0 else format_task_no_emoji
+        for start_id in roots + linked_ids:
+            # Depth-first with an explicit stack of (task, prefix, is_last, depth)
+            stack = [(start_id, "", True, 0)]
+            while stack:
+                task_id, prefix, is_last, depth = stack.pop()
+                if task_id in visited or depth > 10:
+                    continue
+                visited.add(task_id)
+
+                if depth == 0:
+                    # Root level - no prefix, gets emoji
+                    lines.append(format_task(task_id))
+                    child_prefix = ""
+                else:
+                    # Child level - show tree connector
+                    connector = "└── " if is_last else "├── "
+                    lines.append(prefix + connector + format_task_no_emoji(task_id))
+                    child_prefix = prefix + ("    " if is_last else "│   ")
 
-            if depth == 0:
-                # Root level - no prefix
-                lines.append(formatter(task_id))
-            else:
-                # Child level - show tree connector
-                connector = "└── " if is_last else "├── "
-                lines.append(prefix + connector + formatter(task_id))
+                # Push in reverse so children pop in sorted order
+                task_children = children[task_id]
+                last = len(task_children) - 1
+                for i in range(last, -1, -1):
+                    stack.append((task_children[i], child_prefix, i == last, depth + 1))
 
-            # Calculate prefix for children
-            if depth == 0:
-                child_prefix = ""
-            else:
-                child_prefix = prefix + ("    " if is_last else "│   ")
+    # Add isolated tasks as plain list (standalone, get emoji)
+    for tid in isolated_ids:
+        lines.append(format_task(tid))
 
-            for i, child_id in enumerate(task_children):
-                is_last_child = (i == len(task_children) - 1)
-                add_lines(child_id, child_prefix, is_last_child, depth + 1)
+    return lines
 
-        for root_id in roots:
-            add_lines(root_id)
 
-        # Add any unvisited linked tasks (handles cycles)
-        for task_id in sorted(linked_ids):
-            if task_id not in visited:
-                add_lines(task_id)
+def _build_dag_content(
+    task_ids: set[int],
+    adjacency: dict[int, list[int]],
+    format_task: callable,
+    format_task_no_emoji: callable,
+) -> str:
+    """Build tree content for a set of tasks.
 
-    # Add isolated tasks as plain list (standalone, get emoji)
-    for tid in sorted(isolated_ids):
-        lines.append(format_task(tid))
+    Returns a string with tree structure for linked tasks and plain list for isolated tasks.
+    Root tasks and standalone tasks get emoji, child tasks don't.
+    """
+    if not task_ids:
+        return ""
+    return "\n".join(_tree_lines(task_ids, adjacency, format_task, format_task_no_emoji))
 
-    return "\n".join(lines)
 
+def _get_descendants(task_ids: set[int], adjacency: dict[int, list[int]]) -> set[int]:
+    """Get all tasks reachable from any of task_ids, given State.get_adjacency().
 
-def _get_descendants(task_id: int, edges: list) -> set[int]:
-    """Get all descendants of a task."""
-    descendants: set[int] = set()
-    stack = [task_id]
+    A single traversal from all starting tasks, so shared subtrees are only
+    walked once. The starting tasks themselves are not included.
+    """
+    seen = set(task_ids)
+    stack = list(task_ids)
     while stack:
         current = stack.pop()
-        for edge in edges:
-            if edge.from_id == current and edge.to_id not in descendants:
-                descendants.add(edge.to_id)
-                stack.append(edge.to_id)
-    return descendants
+        for to_id in adjacency.get(current, ()):
+            if to_id not in seen:
+                seen.add(to_id)
+                stack.append(to_id)
+    return seen - task_ids
 
 
 def render_dag(state: State) -> None:
     """Render tasks as trees grouped by state."""
+    from rich.console import Console
+    from rich.panel import Panel
+
     console = Console()
 
     if not state.tasks and not state.blocked:
@@ -360,12 +376,10 @@ def render_dag(state: State) -> None:
     inactive_ids: set[int] = set()
     blocked_ids: set[int] = set()
 
-    all_tasks: dict[int, Task] = {}
+    all_tasks: dict[int, Task] = state.tasks
     blocked_tasks: dict[int, BlockedTask] = {}
 
-    for tid, task in state.tasks.items():
-        task_id = int(tid)
-        all_tasks[task_id] = task
+    for task_id, task in all_tasks.items():
         if task.active:
             active_ids.add(task_id)
         else:
@@ -376,12 +390,8 @@ def render_dag(state: State) -> None:
         blocked_tasks[blocked.id] = blocked
 
     # Find inactive tasks that are descendants of active tasks (active workflow)
-    active_workflow_ids: set[int] = set()
-    for active_id in active_ids:
-        descendants = _get_descendants(active_id, state.edges)
-        for desc_id in descendants:
-            if desc_id in inactive_ids:
-                active_workflow_ids.add(desc_id)
+    adjacency = state.get_adjacency()
+    active_workflow_ids = _get_descendants(active_ids, adjacency) & inactive_ids
 
     # Remove active workflow tasks from backlog
     backlog_ids = inactive_ids - active_workflow_ids
@@ -391,42 +401,48 @@ def render_dag(state: State) -> None:
 
     # Render ON HOLD panel
     if blocked_ids:
+        hold = bufo("hold")
+
         def format_blocked(tid: int) -> str:
             b = blocked_tasks[tid]
-            return f"{bufo('hold')} [cyan][{tid}][/cyan] {b.title} [dim]({b.blocker})[/dim]"
+            return f"{hold} [cyan][{tid}][/cyan] {b.title} [dim]({b.blocker})[/dim]"
 
         def format_blocked_no_emoji(tid: int) -> str:
             b = blocked_tasks[tid]
             return f"[cyan][{tid}][/cyan] {b.title} [dim]({b.blocker})[/dim]"
 
-        content = _build_dag_content(blocked_ids, state.edges, format_blocked, format_blocked_no_emoji)
+        content = _build_dag_content(blocked_ids, adjacency, format_blocked, format_blocked_no_emoji)
         if content:
             panel = Panel(content, title="[bold yellow]ON HOLD[/bold yellow]", border_style="yellow")
             console.print(panel)
 
     # Render BACKLOG panel (inactive tasks NOT in active workflow)
     if backlog_ids:
+        backlog = bufo("backlog")
+
         def format_backlog(tid: int) -> str:
             task = all_tasks[tid]
-            return f"{bufo('backlog')} [cyan][{tid}][/cyan] {task.title}"
+            return f"{backlog} [cyan][{tid}][/cyan] {task.title}"
 
         def format_backlog_no_emoji(tid: int) -> str:
             task = all_tasks[tid]
             return f"[cyan][{tid}][/cyan] {task.title}"
 
-        content = _build_dag_content(backlog_ids, state.edges, format_backlog, format_backlog_no_emoji)
+        content = _build_dag_content(backlog_ids, adjacency, format_backlog, format_backlog_no_emoji)
         if content:
             panel = Panel(content, title="[bold blue]BACKLOG[/bold blue]", border_style="blue")
             console.print(panel)
 
     # Render ACTIVE panel (active tasks + their inactive descendants dimmed)
     if active_panel_ids:
+        active, backlog = bufo("active"), bufo("backlog")
+
         def format_active(tid: int) -> str:
             task = all_tasks[tid]
             if tid in active_workflow_ids:
                 # Dimmed - part of active workflow but waiting
-                return f"[dim]{bufo('backlog')} [cyan][{tid}][/cyan] {task.title}[/dim]"
-            return f"{bufo('active')} [cyan][{tid}][/cyan] {task.title}"
+                return f"[dim]{backlog} [cyan][{tid}][/cyan] {task.title}[/dim]"
+            return f"{active} [cyan][{tid}][/cyan] {task.title}"
 
         def format_active_no_emoji(tid: int) -> str:
             task = all_tasks[tid]
@@ -434,7 +450,7 @@ def render_dag(state: State) -> None:
                 return f"[dim][cyan][{tid}][/cyan] {task.title}[/dim]"
             return f"[cyan][{tid}][/cyan] {task.title}"
 
-        content = _build_dag_content(active_panel_ids, state.edges, format_active, format_active_no_emoji)
+        content = _build_dag_content(active_panel_ids, adjacency, format_active, format_active_no_emoji)
         if content:
             panel = Panel(content, title="[bold green]ACTIVE[/bold green]", border_style="green")
             console.print(panel)
@@ -448,7 +464,7 @@ def render_blocked(blocked: list[BlockedTask]) -> None:
 
 def _build_dag_content_simple(
     task_ids: set[int],
-    edges: list,
+    adjacency: dict[int, list[int]],
     format_task: callable,
     format_task_no_emoji: callable,
     c: type,
@@ -460,72 +476,7 @@ def _build_dag_content_simple(
     """
     if not task_ids:
         return []
-
-    # Build adjacency maps for tasks in this set
-    children: dict[int, list[int]] = {tid: [] for tid in task_ids}
-    parents: dict[int, list[int]] = {tid: [] for tid in task_ids}
-
-    for edge in edges:
-        # Only include edges where both endpoints are in our set
-        if edge.from_id in task_ids and edge.to_id in task_ids:
-            children[edge.from_id].append(edge.to_id)
-            parents[edge.to_id].append(edge.from_id)
-
-    # Separate isolated tasks (no edges) from linked tasks
-    isolated_ids = [tid for tid in task_ids if not children[tid] and not parents[tid]]
-    linked_ids = task_ids - set(isolated_ids)
-
-    lines: list[str] = []
-
-    # Build tree for linked tasks using manual formatting
-    if linked_ids:
-        # Find root tasks (no parents within linked set)
-        roots = [tid for tid in linked_ids if not parents.get(tid, [])]
-        roots.sort()
-
-        visited: set[int] = set()
-
-        def add_lines(task_id: int, prefix: str = "", is_last: bool = True, depth: int = 0) -> None:
-            if task_id in visited or depth > 10:
-                return
-            visited.add(task_id)
-
-            task_children = sorted(children.get(task_id, []))
-
-            # Root tasks (depth 0) get emoji, children don't
-            formatter = format_task if depth == 0 else format_task_no_emoji
-
-            if depth == 0:
-                # Root level - no prefix
-                lines.append(f"  {formatter(task_id)}")
-            else:
-                # Child level - show tree connector
-                connector = "└── " if is_last else "├── "
-                lines.append(f"  {prefix}{connector}{formatter(task_id)}")
-
-            # Calculate prefix for children
-            if depth == 0:
-                child_prefix = ""
-            else:
-                child_prefix = prefix + ("    " if is_last else "│   ")
-
-            for i, child_id in enumerate(task_children):
-                is_last_child = i == len(task_children) - 1
-                add_lines(child_id, child_prefix, is_last_child, depth + 1)
-
-        for root_id in roots:
-            add_lines(root_id)
-
-        # Add any unvisited linked tasks (handles cycles)
-        for task_id in sorted(linked_ids):
-            if task_id not in visited:
-                add_lines(task_id)
-
-    # Add isolated tasks as plain list (standalone, get emoji)
-    for tid in sorted(isolated_ids):
-        lines.append(f"  {format_task(tid)}")
-
-    return lines
+    return [f"  {line}" for line in _tree_lines(task_ids, adjacency, format_task, format_task_no_emoji)]
 
 
 def render_dag_simple(state: State) -> None:
@@ -542,12 +493,10 @@ def render_dag_simple(state: State) -> None:
     inactive_ids: set[int] = set()
     blocked_ids: set[int] = set()
 
-    all_tasks: dict[int, Task] = {}
+    all_tasks: dict[int, Task] = state.tasks
     blocked_tasks: dict[int, BlockedTask] = {}
 
-    for tid, task in state.tasks.items():
-        task_id = int(tid)
-        all_tasks[task_id] = task
+    for task_id, task in all_tasks.items():
         if task.active:
             active_ids.add(task_id)
         else:
@@ -558,69 +507,64 @@ def render_dag_simple(state: State) -> None:
         blocked_tasks[blocked.id] = blocked
 
     # Find inactive tasks that are descendants of active tasks
-    active_workflow_ids: set[int] = set()
-    for active_id in active_ids:
-        descendants = _get_descendants(active_id, state.edges)
-        for desc_id in descendants:
-            if desc_id in inactive_ids:
-                active_workflow_ids.add(desc_id)
+    adjacency = state.get_adjacency()
+    active_workflow_ids = _get_descendants(active_ids, adjacency) & inactive_ids
 
     backlog_ids = inactive_ids - active_workflow_ids
     active_panel_ids = active_ids | active_workflow_ids
 
     c = Colors
+    # Bound once, as the formatters below run for every task
+    dim, cyan, reset = c.DIM, c.CYAN, c.RESET
 
     # Render ACTIVE section
     if active_panel_ids:
+        active, backlog = bufo("active"), bufo("backlog")
+
         def format_active(tid: int) -> str:
             task = all_tasks[tid]
             if tid in active_workflow_ids:
                 # Dimmed - part of active workflow but waiting
-                return f"{c.DIM}{bufo('backlog')} {c.CYAN}[{tid}]{c.RESET}{c.DIM} {task.title}{c.RESET}"
-            return f"{bufo('active')} {c.CYAN}[{tid}]{c.RESET} {task.title}"
+                return f"{dim}{backlog} {cyan}[{tid}]{reset}{dim} {task.title}{reset}"
+            return f"{active} {cyan}[{tid}]{reset} {task.title}"
 
         def format_active_no_emoji(tid: int) -> str:
             task = all_tasks[tid]
             if tid in active_workflow_ids:
-                return f"{c.DIM}{c.CYAN}[{tid}]{c.RESET}{c.DIM} {task.title}{c.RESET}"
-            return f"{c.CYAN}[{tid}]{c.RESET} {task.title}"
+                return f"{dim}{cyan}[{tid}]{reset}{dim} {task.title}{reset}"
+            return f"{cyan}[{tid}]{reset} {task.title}"
 
-        print(f"\n{c.BOLD}{c.GREEN}── ACTIVE ──{c.RESET}")
-        lines = _build_dag_content_simple(active_panel_ids, state.edges, format_active, format_active_no_emoji, c)
-        for line in lines:
-            sys.stdout.write(line + "\n")
-        sys.stdout.flush()
+        lines = _build_dag_content_simple(active_panel_ids, adjacency, format_active, format_active_no_emoji, c)
+        _write_section(f"{c.BOLD}{c.GREEN}── ACTIVE ──{c.RESET}", lines)
 
     # Render ON HOLD section
     if blocked_ids:
+        hold = bufo("hold")
+
         def format_blocked(tid: int) -> str:
             b = blocked_tasks[tid]
-            return f"{bufo('hold')} {c.CYAN}[{tid}]{c.RESET} {b.title} {c.DIM}({b.blocker}){c.RESET}"
+            return f"{hold} {cyan}[{tid}]{reset} {b.title} {dim}({b.blocker}){reset}"
 
         def format_blocked_no_emoji(tid: int) -> str:
             b = blocked_tasks[tid]
-            return f"{c.CYAN}[{tid}]{c.RESET} {b.title} {c.DIM}({b.blocker}){c.RESET}"
+            return f"{cyan}[{tid}]{reset} {b.title} {dim}({b.blocker}){reset}"
 
-        print(f"\n{c.BOLD}{c.YELLOW}── ON HOLD ──{c.RESET}")
-        lines = _build_dag_content_simple(blocked_ids, state.edges, format_blocked, format_blocked_no_emoji, c)
-        for line in lines:
-            sys.stdout.write(line + "\n")
-        sys.stdout.flush()
+        lines = _build_dag_content_simple(blocked_ids, adjacency, format_blocked, format_blocked_no_emoji, c)
+        _write_section(f"{c.BOLD}{c.YELLOW}── ON HOLD ──{c.RESET}", lines)
 
     # Render BACKLOG section
     if backlog_ids:
+        backlog = bufo("backlog")
+
         def format_backlog(tid: int) -> str:
             task = all_tasks[tid]
-            return f"{bufo('backlog')} {c.CYAN}[{tid}]{c.RESET} {task.title}"
+            return f"{backlog} {cyan}[{tid}]{reset} {task.title}"
 
         def format_backlog_no_emoji(tid: int) -> str:
             task = all_tasks[tid]
-            return f"{c.CYAN}[{tid}]{c.RESET} {task.title}"
+            return f"{cyan}[{tid}]{reset} {task.title}"
 
-        print(f"\n{c.BOLD}{c.BLUE}── BACKLOG ──{c.RESET}")
-        lines = _build_dag_content_simple(backlog_ids, state.edges, format_backlog, format_backlog_no_emoji, c)
-        for line in lines:
-            sys.stdout.write(line + "\n")
-        sys.stdout.flush()
+        lines = _build_dag_content_simple(backlog_ids, adjacency, format_backlog, format_backlog_no_emoji, c)
+        _write_section(f"{c.BOLD}{c.BLUE}── BACKLOG ──{c.RESET}", lines)
 
     print()  # Final newline
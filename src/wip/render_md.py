@@ -1,21 +1,36 @@
 """Markdown rendering for shareable WIP view."""
 
+import hashlib
 from datetime import datetime, timedelta
 
 from .model import BlockedTask, HistoryEntry, State, Task
 
+# Deeper links are cut off; list bullets for each indent level
+_MAX_DEPTH = 10
+_BULLETS = tuple("  " * depth + "- " for depth in range(_MAX_DEPTH + 1))
 
-def _get_descendants(task_id: int, edges: list) -> set[int]:
-    """Get all descendants of a task."""
-    descendants: set[int] = set()
-    stack = [task_id]
+
+def _get_descendants(task_ids: set[int], adjacency: dict[int, list[int]]) -> set[int]:
+    """Get all tasks reachable from any of task_ids, given State.get_adjacency().
+
+    A single traversal from all starting tasks, so shared subtrees are only
+    walked once. The starting tasks themselves are not included.
+    """
+    seen = set(task_ids)
+    stack = list(task_ids)
     while stack:
         current = stack.pop()
-        for edge in edges:
-            if edge.from_id == current and edge.to_id not in descendants:
-                descendants.add(edge.to_id)
-                stack.append(edge.to_id)
-    return descendants
+        for to_id in adjacency.get(current, ()):
+            if to_id not in seen:
+                seen.add(to_id)
+                stack.append(to_id)
+    return seen - task_ids
+
+
+def content_digest(md: str) -> str:
+    """Hash rendered Markdown, ignoring the "Updated" footer."""
+    body = md.rpartition("\n---\n")[0]
+    return hashlib.sha256(body.encode()).hexdigest()
 
 
 def _get_week_tasks(history: list[HistoryEntry]) -> list[HistoryEntry]:
@@ -29,46 +44,44 @@ def _get_week_tasks(history: list[HistoryEntry]) -> list[HistoryEntry]:
 
 def _render_task_tree_md(
     task_ids: set[int],
-    edges: list,
+    adjacency: dict[int, list[int]],
     format_task: callable,
     indent: str = "",
 ) -> list[str]:
-    """Build markdown tree structure for tasks."""
+    """Build markdown tree structure for tasks, given State.get_adjacency()."""
     if not task_ids:
         return []
+    if not adjacency:
+        return ["- " + format_task(tid, True) for tid in sorted(task_ids)]
 
-    children: dict[int, list[int]] = {tid: [] for tid in task_ids}
-    parents: dict[int, list[int]] = {tid: [] for tid in task_ids}
-
-    for edge in edges:
-        if edge.from_id in task_ids and edge.to_id in task_ids:
-            children[edge.from_id].append(edge.to_id)
-            parents[edge.to_id].append(edge.from_id)
+    children = {tid: sorted(c for c in adjacency.get(tid, ()) if c in task_ids) for tid in task_ids}
+    has_parent = {c for tid in task_ids for c in children[tid]}
 
-    isolated = [tid for tid in task_ids if not children[tid] and not parents[tid]]
-    linked = task_ids - set(isolated)
+    ordered = sorted(task_ids)
+    isolated = [tid for tid in ordered if not children[tid] and tid not in has_parent]
+    linked = [tid for tid in ordered if children[tid] or tid in has_parent]
 
     lines: list[str] = []
 
     if linked:
-        roots = sorted([tid for tid in linked if not parents.get(tid, [])])
+        roots = [tid for tid in linked if tid not in has_parent]
         visited: set[int] = set()
 
-        def add_tree(task_id: int, depth: int = 0) -> None:
-            if task_id in visited or depth > 10:
-                return
+        # Depth-first with an explicit stack, pushed in reverse so tasks pop
+        # in ID order
+        stack = [(root_id, 0) for root_id in reversed(roots)]
+        while stack:
+            task_id, depth = stack.pop()
+            if task_id in visited or depth > _MAX_DEPTH:
+                continue
             visited.add(task_id)
 
-            prefix = "  " * depth + "- " if depth > 0 else "- "
-            lines.append(prefix + format_task(task_id, depth == 0))
-
-            for child_id in sorted(children.get(task_id, [])):
-                add_tree(child_id, depth + 1)
+            lines.append(_BULLETS[depth] + format_task(task_id, depth == 0))
 
-        for root_id in roots:
-            add_tree(root_id)
+            for child_id in reversed(children[task_id]):
+                stack.append((child_id, depth + 1))
 
-    for tid in sorted(isolated):
+    for tid in isolated:
         lines.append("- " + format_task(tid, True))
 
     return lines
@@ -83,12 +96,10 @@ def render_state_md(state: State) -> str:
     inactive_ids: set[int] = set()
     blocked_ids: set[int] = set()
 
-    all_tasks: dict[int, Task] = {}
+    all_tasks: dict[int, Task] = state.tasks
     blocked_tasks: dict[int, BlockedTask] = {}
 
-    for tid, task in state.tasks.items():
-        task_id = int(tid)
-        all_tasks[task_id] = task
+    for task_id, task in all_tasks.items():
         if task.active:
             active_ids.add(task_id)
         else:
@@ -99,12 +110,8 @@ def render_state_md(state: State) -> str:
         blocked_tasks[blocked.id] = blocked
 
     # Find workflow tasks (inactive descendants of active)
-    active_workflow_ids: set[int] = set()
-    for active_id in active_ids:
-        descendants = _get_descendants(active_id, state.edges)
-        for desc_id in descendants:
-            if desc_id in inactive_ids:
-                active_workflow_ids.add(desc_id)
+    adjacency = state.get_adjacency()
+    active_workflow_ids = _get_descendants(active_ids, adjacency) & inactive_ids
 
     backlog_ids = inactive_ids - active_workflow_ids
     active_panel_ids = active_ids | active_workflow_ids
@@ -126,7 +133,7 @@ def render_state_md(state: State) -> str:
                 return f"**[{tid}] {task.title}**"
             return f"*[{tid}] {task.title}*"
 
-        lines.extend(_render_task_tree_md(active_panel_ids, state.edges, format_active))
+        lines.extend(_render_task_tree_md(active_panel_ids, adjacency, format_active))
         lines.append("")
 
     # On Hold section
@@ -138,7 +145,7 @@ def render_state_md(state: State) -> str:
             b = blocked_tasks[tid]
             return f"[{tid}] {b.title} _{b.blocker}_"
 
-        lines.extend(_render_task_tree_md(blocked_ids, state.edges, format_blocked))
+        lines.extend(_render_task_tree_md(blocked_ids, adjacency, format_blocked))
         lines.append("")
 
     # Backlog section
@@ -150,7 +157,7 @@ def render_state_md(state: State) -> str:
             task = all_tasks[tid]
             return f"[{tid}] {task.title}"
 
-        lines.extend(_render_task_tree_md(backlog_ids, state.edges, format_backlog))
+        lines.extend(_render_task_tree_md(backlog_ids, adjacency, format_backlog))
         lines.append("")
 
     # Weekly progress section
@@ -159,18 +166,18 @@ def render_state_md(state: State) -> str:
 
     if week_tasks:
         day_names = ["Mon", "Tue", "Wed", "Thu", "Fri"]
-        tasks_by_day: dict[int, list[str]] = {i: [] for i in range(5)}
+        tasks_by_day: list[list[str]] = [[] for _ in range(5)]
+        appenders = [day.append for day in tasks_by_day]
         for entry in week_tasks:
             day_idx = entry.completed_datetime.weekday()
             if day_idx < 5:  # Only include weekdays
-                tasks_by_day[day_idx].append(entry.title)
+                appenders[day_idx](entry.title)
 
         weekday_count = sum(len(tasks_by_day[i]) for i in range(5))
         if weekday_count > 0:
-            for day_idx in range(5):
-                if tasks_by_day[day_idx]:
-                    for title in tasks_by_day[day_idx]:
-                        lines.append(f"- **{day_names[day_idx]}**: {title}")
+            for day_name, titles in zip(day_names, tasks_by_day):
+                prefix = f"- **{day_name}**: "
+                lines.extend([prefix + title for title in titles])
 
             lines.append("")
             lines.append(f"*{weekday_count} completed*")
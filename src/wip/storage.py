@@ -1,10 +1,20 @@
 """JSON persistence for WIP state."""
 
 import atexit
+import io
 import json
+import os
+import shutil
 import sys
+import tempfile
 import threading
 from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "fast" extra
+    orjson = None
 
 from .model import State
 
@@ -15,18 +25,32 @@ BACKUP_DIR = DEFAULT_STATE_DIR / "backups"
 # Can be disabled for testing
 _auto_publish_enabled = True
 
-# Track publish thread for cleanup
+# Track publish thread for cleanup. Saves made while it is running only
+# replace the pending content, so a burst of saves ends in a single update.
 _publish_thread: threading.Thread | None = None
+_publish_pending: tuple[str, str, Path | None] | None = None
+_publish_lock = threading.Lock()
+_atexit_registered = False
 
+# Serializes state file writes between save_state and the publish thread
+_save_lock = threading.Lock()
 
-def _wait_for_publish() -> None:
-    """Wait for any pending publish to complete before exit."""
-    global _publish_thread
-    if _publish_thread is not None and _publish_thread.is_alive():
-        _publish_thread.join(timeout=20)
+# Directories already created by this process
+_dirs_ensured: set[Path] = set()
 
+# Process umask, for the mode of newly created files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
-atexit.register(_wait_for_publish)
+# Parsed contents of the last state file read, keyed by (path, mtime_ns, size)
+_load_cache: tuple[tuple[Path, int, int], Any] | None = None
+
+
+def _wait_for_publish() -> None:
+    """Wait for any pending publish to complete before exit."""
+    thread = _publish_thread
+    if thread is not None and thread.is_alive():
+        thread.join(timeout=20)
 
 
 def set_auto_publish(enabled: bool) -> None:
@@ -35,11 +59,87 @@ def set_auto_publish(enabled: bool) -> None:
     _auto_publish_enabled = enabled
 
 
+def encode_json(data: dict[str, Any], *, indent: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, using orjson when installed.
+
+    Output is compact unless indent is set, and always ends with a newline.
+    """
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, **_stdlib_format(indent)).encode() + b"\n"
+
+
+def _stdlib_format(indent: bool) -> dict[str, Any]:
+    """json.dump(s) arguments matching orjson's compact or indented output."""
+    return {"indent": 2} if indent else {"separators": (",", ":")}
+
+
+def dump_json(data: dict[str, Any], path: Path, *, indent: bool = False) -> None:
+    """Write data to path as UTF-8 JSON, compact unless indent is set.
+
+    The file is written next to path and renamed over it, so a crash or
+    full disk never leaves a truncated file behind. With orjson the whole
+    document goes out in one write; without it, the stdlib encoder streams
+    chunks to the file instead of building one big string first.
+
+    A symlinked path is written through to its target, and an existing
+    file keeps its permissions.
+    """
+    parent = path.parent
+    path = path.resolve()
+    # A unique temp name, so concurrent writers never share a temp file
+    try:
+        fd, name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".")
+    except FileNotFoundError:
+        # A directory created earlier by this process may have been removed
+        # since; other missing directories are the caller's error
+        if parent not in _dirs_ensured:
+            raise
+        _ensure_dir(parent, recheck=True)
+        fd, name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".")
+    tmp = Path(name)
+    try:
+        with open(fd, "wb") as f:
+            try:
+                shutil.copymode(path, tmp)
+            except FileNotFoundError:
+                # mkstemp creates files 0600; give new files the usual mode
+                os.chmod(tmp, 0o666 & ~_UMASK)
+            if orjson is not None:
+                f.write(encode_json(data, indent=indent))
+            else:
+                with io.TextIOWrapper(f, encoding="utf-8") as text:
+                    json.dump(data, text, **_stdlib_format(indent))
+                    text.write("\n")
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def decode_json(raw: bytes) -> Any:
+    """Parse UTF-8 JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 def _get_state_file(state_file: Path | None = None) -> Path:
     """Get the state file path, using module-level default if not specified."""
     return state_file if state_file is not None else DEFAULT_STATE_FILE
 
 
+def _ensure_dir(path: Path, *, recheck: bool = False) -> None:
+    """Create a directory (and parents) once per process.
+
+    recheck creates it again, for when it was removed after the first time.
+    """
+    if recheck or path not in _dirs_ensured:
+        path.mkdir(parents=True, exist_ok=True)
+        _dirs_ensured.add(path)
+
+
 def _get_backup_dir() -> Path:
     """Get the backup directory path."""
     return BACKUP_DIR
@@ -50,14 +150,19 @@ def load_state(state_file: Path | None = None) -> State:
 
     If the file doesn't exist, returns a new empty State.
     """
+    global _load_cache
     state_file = _get_state_file(state_file)
-    if not state_file.exists():
+    try:
+        st = state_file.stat()
+    except FileNotFoundError:
         return State()
 
-    with open(state_file) as f:
-        data = json.load(f)
-
-    return State.from_dict(data)
+    # Reuse the parsed JSON while the file is unchanged. Each call still gets
+    # its own State, so callers never share mutable objects.
+    key = (state_file, st.st_mtime_ns, st.st_size)
+    if _load_cache is None or _load_cache[0] != key:
+        _load_cache = (key, decode_json(state_file.read_bytes()))
+    return State.from_dict(_load_cache[1])
 
 
 def save_state(
@@ -73,41 +178,121 @@ def save_state(
         state_file: Optional path to state file
         skip_publish: If True, skip auto-publish (useful after gist creation)
     """
+    global _load_cache
     state_file = _get_state_file(state_file)
-    state_file.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(state_file.parent)
+
+    # Render the shared view before writing so the published hash is saved with
+    # the state. Skip publishing when the visible content hasn't changed; if
+    # the publish fails, the worker clears the hash so the next save retries.
+    md = None
+    share = state.config.share
+    if _auto_publish_enabled and not skip_publish and share.enabled and share.gist_id:
+        try:
+            from .render_md import content_digest, render_state_md
+
+            md = render_state_md(state)
+            digest = content_digest(md)
+            if digest == share.content_hash:
+                md = None
+            else:
+                share.content_hash = digest
+        except Exception as e:
+            print(f"[share] Update failed: {e}", file=sys.stderr)
+            md = None
+
+    # Commands that change nothing (e.g. marking an active task active) load
+    # and save the same data, so leave the file alone
+    data = state.to_dict()
+    with _save_lock:
+        if not _unchanged_on_disk(state_file, data):
+            _load_cache = None
+            # The state file is machine-read, so keep it compact
+            dump_json(data, state_file)
+
+    if md is not None:
+        _auto_publish(share.gist_id, md, state_file)
+
 
-    with open(state_file, "w") as f:
-        json.dump(state.to_dict(), f, indent=2)
+def _unchanged_on_disk(state_file: Path, data: dict[str, Any]) -> bool:
+    """Check whether state_file still holds exactly data, as last loaded."""
+    if _load_cache is None:
+        return False
+    try:
+        st = state_file.stat()
+    except FileNotFoundError:
+        return False
+    key, loaded = _load_cache
+    return key == (state_file, st.st_mtime_ns, st.st_size) and loaded == data
 
-    # Auto-publish if sharing is enabled
-    if (
-        _auto_publish_enabled
-        and not skip_publish
-        and state.config.share.enabled
-        and state.config.share.gist_id
-    ):
-        _auto_publish(state)
 
+_RETRY_HINT = " (will retry on the next save, or run 'wip share --refresh')"
 
-def _auto_publish(state: State) -> None:
-    """Publish state to gist in background. Non-blocking."""
-    global _publish_thread
 
-    def publish():
+def _auto_publish(gist_id: str, md: str, state_file: Path | None = None) -> None:
+    """Publish rendered Markdown to gist in background. Non-blocking.
+
+    If a publish is already in flight, only the latest content is sent once
+    it finishes. If it fails, the content hash recorded in state_file is
+    cleared so that the next save publishes again.
+    """
+    global _publish_thread, _publish_pending, _atexit_registered
+    with _publish_lock:
+        _publish_pending = (gist_id, md, state_file)
+        # Only processes that actually publish need to wait on exit
+        if not _atexit_registered:
+            atexit.register(_wait_for_publish)
+            _atexit_registered = True
+        if _publish_thread is None:
+            _publish_thread = threading.Thread(target=_publish_worker)
+            _publish_thread.start()
+
+
+def _publish_worker() -> None:
+    """Publish pending content until there is none left."""
+    global _publish_thread, _publish_pending
+    while True:
+        with _publish_lock:
+            if _publish_pending is None:
+                _publish_thread = None
+                return
+            gist_id, md, state_file = _publish_pending
+            _publish_pending = None
+
         try:
             from .gist import update_gist
-            from .render_md import render_state_md
-
-            md = render_state_md(state)
-            result = update_gist(state.config.share.gist_id, "wip.md", md)
 
-            if not result.success:
-                print(f"[share] Update failed: {result.error}", file=sys.stderr)
+            result = update_gist(gist_id, "wip.md", md)
+            error = None if result.success else result.error
         except Exception as e:
-            print(f"[share] Update failed: {e}", file=sys.stderr)
+            error = str(e)
+
+        if error is not None:
+            print(f"[share] Update failed: {error}{_RETRY_HINT}", file=sys.stderr)
+            if state_file is not None:
+                _forget_content_hash(state_file, md)
+
 
-    _publish_thread = threading.Thread(target=publish)
-    _publish_thread.start()
+def _forget_content_hash(state_file: Path, md: str) -> None:
+    """Clear the saved content hash if it is still the one for md.
+
+    A newer save records a different hash and publishes on its own, so
+    only a hash for the content that failed to go out is cleared.
+    """
+    global _load_cache
+    try:
+        from .render_md import content_digest
+
+        with _save_lock:
+            state = load_state(state_file)
+            share = state.config.share
+            if share.content_hash != content_digest(md):
+                return
+            share.content_hash = None
+            _load_cache = None
+            dump_json(state.to_dict(), state_file)
+    except Exception as e:
+        print(f"[share] Could not record failed update: {e}", file=sys.stderr)
 
 
 def backup_state(state_file: Path | None = None) -> Path | None:
@@ -122,12 +307,18 @@ def backup_state(state_file: Path | None = None) -> Path | None:
     from datetime import datetime
 
     backup_dir = _get_backup_dir()
-    backup_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(backup_dir)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_file = backup_dir / f"state_{timestamp}.json"
 
-    # Copy current state to backup
-    backup_file.write_text(state_file.read_text())
+    # Copy rather than hard link: a save skipped as unchanged would leave the
+    # two names on one inode, so any in-place edit of the state file would
+    # also rewrite the backup. copyfile uses the kernel's fast copy paths.
+    try:
+        shutil.copyfile(state_file, backup_file)
+    except FileNotFoundError:
+        _ensure_dir(backup_dir, recheck=True)
+        shutil.copyfile(state_file, backup_file)
 
     return backup_file
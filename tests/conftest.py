@@ -3,6 +3,23 @@
 import json
 
 import pytest
+from click.testing import CliRunner
+
+
+@pytest.fixture(autouse=True)
+def isolate_gist(monkeypatch):
+    """Keep gist calls on the mocked gh path regardless of the environment or earlier tests."""
+    monkeypatch.delenv("GH_TOKEN", raising=False)
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    from wip.gist import _gh_auth_status
+
+    _gh_auth_status.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def runner():
+    """Return a CliRunner shared by the tests in a module."""
+    return CliRunner()
 
 
 @pytest.fixture
@@ -13,9 +30,9 @@ def temp_state_dir(tmp_path):
     return state_dir
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def empty_state():
-    """Return an empty state dict."""
+    """Return an empty state dict (shared across the session; don't mutate)."""
     return {
         "tasks": {},
         "edges": [],
@@ -26,9 +43,9 @@ def empty_state():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_state():
-    """Return a sample state with some tasks."""
+    """Return a sample state with some tasks (shared across the session; don't mutate)."""
     return {
         "tasks": {
             "1": {"id": 1, "title": "Design API", "active": True, "created_at": "2025-01-12T09:00:00"},
@@ -45,19 +62,53 @@ def sample_state():
     }
 
 
+@pytest.fixture(scope="session")
+def sample_state_with_share(sample_state):
+    """Return the sample state with sharing enabled (shared across the session; don't mutate)."""
+    return {
+        **sample_state,
+        "config": {
+            **sample_state["config"],
+            "share": {
+                "enabled": True,
+                "gist_id": "test123",
+                "gist_url": "https://gist.github.com/user/test123",
+            },
+        },
+    }
+
+
+@pytest.fixture(scope="session")
+def empty_state_bytes(empty_state):
+    """Return the empty state serialized once per session."""
+    return json.dumps(empty_state).encode()
+
+
+@pytest.fixture(scope="session")
+def sample_state_bytes(sample_state):
+    """Return the sample state serialized once per session."""
+    return json.dumps(sample_state).encode()
+
+
+@pytest.fixture(scope="session")
+def sample_state_with_share_bytes(sample_state_with_share):
+    """Return the share-enabled sample state serialized once per session."""
+    return json.dumps(sample_state_with_share).encode()
+
+
 @pytest.fixture
-def state_file(temp_state_dir, empty_state):
+def state_file(temp_state_dir, empty_state_bytes):
     """Create a state file with empty state."""
     state_path = temp_state_dir / "state.json"
-    state_path.write_text(json.dumps(empty_state))
+    state_path.write_bytes(empty_state_bytes)
     return state_path
 
 
 @pytest.fixture
-def sample_state_file(temp_state_dir, sample_state):
+def sample_state_file(temp_state_dir, sample_state_bytes):
     """Create a state file with sample data."""
     state_path = temp_state_dir / "state.json"
-    state_path.write_text(json.dumps(sample_state))
+    state_path.write_bytes(sample_state_bytes)
     return state_path
 
 
@@ -77,14 +128,14 @@ def isolated_storage(tmp_path, monkeypatch):
 
 
 @pytest.fixture
-def isolated_storage_with_sample(tmp_path, monkeypatch, sample_state):
+def isolated_storage_with_sample(tmp_path, monkeypatch, sample_state_bytes):
     """Fixture that isolates storage and pre-populates with sample state."""
     state_dir = tmp_path / ".wip"
     state_file = state_dir / "state.json"
     backup_dir = state_dir / "backups"
 
     state_dir.mkdir(parents=True, exist_ok=True)
-    state_file.write_text(json.dumps(sample_state))
+    state_file.write_bytes(sample_state_bytes)
 
     import wip.storage as storage
     monkeypatch.setattr(storage, "DEFAULT_STATE_DIR", state_dir)
@@ -95,21 +146,14 @@ def isolated_storage_with_sample(tmp_path, monkeypatch, sample_state):
 
 
 @pytest.fixture
-def isolated_storage_with_share(tmp_path, monkeypatch, sample_state):
+def isolated_storage_with_share(tmp_path, monkeypatch, sample_state_with_share_bytes):
     """Fixture that isolates storage with sharing enabled."""
     state_dir = tmp_path / ".wip"
     state_file = state_dir / "state.json"
     backup_dir = state_dir / "backups"
 
-    # Add share config to sample state
-    sample_state["config"]["share"] = {
-        "enabled": True,
-        "gist_id": "test123",
-        "gist_url": "https://gist.github.com/user/test123",
-    }
-
     state_dir.mkdir(parents=True, exist_ok=True)
-    state_file.write_text(json.dumps(sample_state))
+    state_file.write_bytes(sample_state_with_share_bytes)
 
     import wip.storage as storage
 
@@ -1,7 +1,6 @@
 """Tests for add command."""
 
 import json
-from click.testing import CliRunner
 
 from wip.cli import main
 
@@ -9,9 +8,8 @@ from wip.cli import main
 class TestAddCommand:
     """Tests for wip add command."""
 
-    def test_add_task(self, isolated_storage):
+    def test_add_task(self, isolated_storage, runner):
         """Test adding a regular task."""
-        runner = CliRunner()
         result = runner.invoke(main, ["add", "Test task"])
 
         assert result.exit_code == 0
@@ -19,15 +17,22 @@ class TestAddCommand:
 
         # Verify state was saved
         state_file = isolated_storage["state_file"]
-        data = json.loads(state_file.read_text())
+        data = json.loads(state_file.read_bytes())
         assert "1" in data["tasks"]
         assert data["tasks"]["1"]["title"] == "Test task"
         assert data["tasks"]["1"]["id"] == 1
         assert data["next_id"] == 2
 
-    def test_add_task_increments_id(self, isolated_storage):
+    def test_add_task_timestamp_seconds(self, isolated_storage, runner):
+        """Test that created_at is stored with seconds precision."""
+        runner.invoke(main, ["add", "Test task"])
+
+        state_file = isolated_storage["state_file"]
+        data = json.loads(state_file.read_bytes())
+        assert len(data["tasks"]["1"]["created_at"]) == len("2025-01-12T09:00:00")
+
+    def test_add_task_increments_id(self, isolated_storage, runner):
         """Test that task IDs increment correctly."""
-        runner = CliRunner()
         runner.invoke(main, ["add", "First task"])
         result = runner.invoke(main, ["add", "Second task"])
 
@@ -35,40 +40,37 @@ class TestAddCommand:
         assert "Added task [2]: Second task" in result.output
 
         state_file = isolated_storage["state_file"]
-        data = json.loads(state_file.read_text())
+        data = json.loads(state_file.read_bytes())
         assert "1" in data["tasks"]
         assert "2" in data["tasks"]
         assert data["next_id"] == 3
 
-    def test_add_blocked_task(self, isolated_storage):
+    def test_add_blocked_task(self, isolated_storage, runner):
         """Test adding a blocked task."""
-        runner = CliRunner()
         result = runner.invoke(main, ["add", "Blocked task", "--blocked", "Alice"])
 
         assert result.exit_code == 0
         assert "Added blocked task [1]: Blocked task (blocked by: Alice)" in result.output
 
         state_file = isolated_storage["state_file"]
-        data = json.loads(state_file.read_text())
+        data = json.loads(state_file.read_bytes())
         assert len(data["blocked"]) == 1
         assert data["blocked"][0]["title"] == "Blocked task"
         assert data["blocked"][0]["blocker"] == "Alice"
 
-    def test_add_blocked_task_short_option(self, isolated_storage):
+    def test_add_blocked_task_short_option(self, isolated_storage, runner):
         """Test adding a blocked task with -b shorthand."""
-        runner = CliRunner()
         result = runner.invoke(main, ["add", "Blocked task", "-b", "Bob"])
 
         assert result.exit_code == 0
         assert "blocked by: Bob" in result.output
 
-    def test_add_task_has_created_at(self, isolated_storage):
+    def test_add_task_has_created_at(self, isolated_storage, runner):
         """Test that added tasks have created_at timestamp."""
-        runner = CliRunner()
         runner.invoke(main, ["add", "Test task"])
 
         state_file = isolated_storage["state_file"]
-        data = json.loads(state_file.read_text())
+        data = json.loads(state_file.read_bytes())
         assert data["tasks"]["1"]["created_at"]
         # Should be ISO format
         assert "T" in data["tasks"]["1"]["created_at"]
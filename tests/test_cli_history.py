@@ -0,0 +1,36 @@
+"""Tests for history command."""
+
+import json
+
+from wip.cli import main
+
+
+class TestHistoryCommand:
+    """Tests for wip history command."""
+
+    def test_history_shows_most_recent(self, isolated_storage, monkeypatch, runner):
+        """Test that history shows the most recent tasks, even when out of order."""
+        monkeypatch.setattr("wip.iterm2._IS_ITERM2", False)
+        state_file = isolated_storage["state_file"]
+        state_file.parent.mkdir(parents=True)
+        state_file.write_text(json.dumps({
+            "history": [
+                {"id": 1, "title": "Newest", "completed_at": "2025-01-15T10:00:00"},
+                {"id": 2, "title": "Oldest", "completed_at": "2025-01-01T10:00:00"},
+                {"id": 3, "title": "Middle", "completed_at": "2025-01-10T10:00:00"},
+            ],
+        }))
+
+        result = runner.invoke(main, ["history", "-n", "2"])
+
+        assert result.exit_code == 0
+        assert "Newest" in result.output
+        assert "Middle" in result.output
+        assert "Oldest" not in result.output
+        assert result.output.index("Newest") < result.output.index("Middle")
+
+    def test_history_empty(self, isolated_storage, runner):
+        """Test history with no completed tasks."""
+        result = runner.invoke(main, ["history"])
+
+        assert "No completed tasks." in result.output
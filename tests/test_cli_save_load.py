@@ -1,8 +1,7 @@
 """Tests for save and load commands."""
 
 import json
-
-from click.testing import CliRunner
+from unittest.mock import patch
 
 from wip.cli import main
 
@@ -10,9 +9,8 @@ from wip.cli import main
 class TestSaveCommand:
     """Tests for wip save command."""
 
-    def test_save_creates_file(self, isolated_storage_with_sample, tmp_path):
+    def test_save_creates_file(self, isolated_storage_with_sample, tmp_path, runner):
         """Test that save creates a JSON file with state."""
-        runner = CliRunner()
         output_file = tmp_path / "export.json"
 
         result = runner.invoke(main, ["save", str(output_file)])
@@ -22,32 +20,38 @@ class TestSaveCommand:
         assert output_file.exists()
 
         # Verify file contains valid JSON with expected structure
-        data = json.loads(output_file.read_text())
+        data = json.loads(output_file.read_bytes())
         assert "tasks" in data
         assert "edges" in data
         assert "blocked" in data
         assert "history" in data
         assert "next_id" in data
 
-    def test_save_includes_all_tasks(self, isolated_storage_with_sample, tmp_path):
+    def test_save_is_pretty_printed(self, isolated_storage_with_sample, tmp_path, runner):
+        """Test that exported files are indented for diffing."""
+        output_file = tmp_path / "export.json"
+
+        runner.invoke(main, ["save", str(output_file)])
+
+        assert output_file.read_text().startswith('{\n  "tasks"')
+
+    def test_save_includes_all_tasks(self, isolated_storage_with_sample, tmp_path, runner):
         """Test that save includes tasks, blocked, and history."""
-        runner = CliRunner()
         output_file = tmp_path / "export.json"
 
         result = runner.invoke(main, ["save", str(output_file)])
 
         assert result.exit_code == 0
 
-        data = json.loads(output_file.read_text())
+        data = json.loads(output_file.read_bytes())
         # Sample state has 3 tasks, 1 blocked, 1 history
         assert len(data["tasks"]) == 3
         assert len(data["blocked"]) == 1
         assert len(data["history"]) == 1
         assert len(data["edges"]) == 1
 
-    def test_save_empty_state(self, isolated_storage, tmp_path):
+    def test_save_empty_state(self, isolated_storage, tmp_path, runner):
         """Test saving empty state."""
-        runner = CliRunner()
         output_file = tmp_path / "export.json"
 
         result = runner.invoke(main, ["save", str(output_file)])
@@ -59,10 +63,8 @@ class TestSaveCommand:
 class TestLoadCommand:
     """Tests for wip load command."""
 
-    def test_load_replaces_state(self, isolated_storage, tmp_path):
+    def test_load_replaces_state(self, isolated_storage, tmp_path, runner):
         """Test that load replaces current state."""
-        runner = CliRunner()
-
         # Create a file to import
         import_data = {
             "tasks": {
@@ -84,14 +86,12 @@ class TestLoadCommand:
 
         # Verify state was replaced
         state_file = isolated_storage["state_file"]
-        data = json.loads(state_file.read_text())
+        data = json.loads(state_file.read_bytes())
         assert "1" in data["tasks"]
         assert data["tasks"]["1"]["title"] == "Imported task"
 
-    def test_load_creates_backup(self, isolated_storage_with_sample, tmp_path):
+    def test_load_creates_backup(self, isolated_storage_with_sample, tmp_path, runner):
         """Test that load creates backup before replacing."""
-        runner = CliRunner()
-
         import_data = {
             "tasks": {},
             "edges": [],
@@ -114,10 +114,8 @@ class TestLoadCommand:
         backups = list(backup_dir.glob("state_*.json"))
         assert len(backups) >= 1
 
-    def test_load_merge_renumbers_ids(self, isolated_storage_with_sample, tmp_path):
+    def test_load_merge_renumbers_ids(self, isolated_storage_with_sample, tmp_path, runner):
         """Test that load --merge renumbers imported IDs."""
-        runner = CliRunner()
-
         # Import data with IDs that would conflict
         import_data = {
             "tasks": {
@@ -140,7 +138,7 @@ class TestLoadCommand:
 
         # Verify original tasks still exist and imported task has new ID
         state_file = isolated_storage_with_sample["state_file"]
-        data = json.loads(state_file.read_text())
+        data = json.loads(state_file.read_bytes())
 
         # Original task 1 should still exist
         assert "1" in data["tasks"]
@@ -150,10 +148,27 @@ class TestLoadCommand:
         assert "6" in data["tasks"]
         assert data["tasks"]["6"]["title"] == "Conflicting ID task"
 
-    def test_load_merge_preserves_edges(self, isolated_storage_with_sample, tmp_path):
-        """Test that load --merge remaps edge references."""
-        runner = CliRunner()
+    def test_load_merge_assigns_unique_ids(self, isolated_storage_with_sample, sample_state_bytes, tmp_path, runner):
+        """Test that merged tasks, blocked tasks and history get distinct new IDs."""
+        import_file = tmp_path / "import.json"
+        import_file.write_bytes(sample_state_bytes)
+
+        result = runner.invoke(main, ["load", str(import_file), "--merge"])
+        assert result.exit_code == 0
 
+        state_file = isolated_storage_with_sample["state_file"]
+        data = json.loads(state_file.read_bytes())
+        # Sample has 5 IDs (3 tasks, 1 blocked, 1 history) and next_id 6
+        new_ids = sorted(
+            [int(k) for k in data["tasks"] if int(k) >= 6]
+            + [b["id"] for b in data["blocked"] if b["id"] >= 6]
+            + [h["id"] for h in data["history"] if h["id"] >= 6]
+        )
+        assert new_ids == [6, 7, 8, 9, 10]
+        assert data["next_id"] == 11
+
+    def test_load_merge_preserves_edges(self, isolated_storage_with_sample, tmp_path, runner):
+        """Test that load --merge remaps edge references."""
         import_data = {
             "tasks": {
                 "1": {"id": 1, "title": "Parent", "active": False, "created_at": "2025-01-15T10:00:00"},
@@ -174,7 +189,7 @@ class TestLoadCommand:
 
         # Verify edges were remapped
         state_file = isolated_storage_with_sample["state_file"]
-        data = json.loads(state_file.read_text())
+        data = json.loads(state_file.read_bytes())
 
         # Should have original edge (1->2) plus remapped edge (6->7)
         edges = data["edges"]
@@ -184,10 +199,19 @@ class TestLoadCommand:
         remapped_edge = next((e for e in edges if e["from"] == 6 and e["to"] == 7), None)
         assert remapped_edge is not None
 
-    def test_load_invalid_json(self, isolated_storage, tmp_path):
-        """Test error on invalid JSON file."""
-        runner = CliRunner()
+    def test_load_merge_saves_once(self, isolated_storage_with_sample, sample_state_bytes, tmp_path, runner):
+        """Test that merging many tasks writes state only once."""
+        import_file = tmp_path / "import.json"
+        import_file.write_bytes(sample_state_bytes)
+
+        with patch("wip.cli.save_state") as mock_save:
+            result = runner.invoke(main, ["load", str(import_file), "--merge"])
 
+        assert "Merged 4 tasks" in result.output
+        assert mock_save.call_count == 1
+
+    def test_load_invalid_json(self, isolated_storage, tmp_path, runner):
+        """Test error on invalid JSON file."""
         import_file = tmp_path / "invalid.json"
         import_file.write_text("not valid json {")
 
@@ -195,10 +219,27 @@ class TestLoadCommand:
 
         assert "Error: Invalid JSON" in result.output
 
-    def test_load_nonexistent_file(self, isolated_storage):
-        """Test error on nonexistent file."""
-        runner = CliRunner()
+    def test_load_non_numeric_task_id(self, isolated_storage, tmp_path, runner):
+        """Test error on a task keyed by something other than a number."""
+        import_file = tmp_path / "bad_ids.json"
+        import_file.write_text(json.dumps({"tasks": {"abc": {"id": 1, "title": "Bad key"}}}))
+
+        result = runner.invoke(main, ["load", str(import_file)])
 
+        assert result.exit_code == 0
+        assert "Error: Invalid state format" in result.output
+
+    def test_load_non_utf8_file(self, isolated_storage, tmp_path, runner):
+        """Test error on a file that is not UTF-8 encoded."""
+        import_file = tmp_path / "latin1.json"
+        import_file.write_bytes('{"tasks": "caf\xe9"}'.encode("latin-1"))
+
+        result = runner.invoke(main, ["load", str(import_file)])
+
+        assert "Error: Invalid JSON" in result.output
+
+    def test_load_nonexistent_file(self, isolated_storage, runner):
+        """Test error on nonexistent file."""
         result = runner.invoke(main, ["load", "/nonexistent/file.json"])
 
         assert result.exit_code != 0
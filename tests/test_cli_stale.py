@@ -0,0 +1,24 @@
+"""Tests for stale command."""
+
+from wip.cli import main
+
+
+class TestStaleCommand:
+    """Tests for wip stale command."""
+
+    def test_stale_lists_old_inactive_tasks(self, isolated_storage_with_sample, monkeypatch, runner):
+        """Test that old inactive and blocked tasks are listed, active ones are not."""
+        monkeypatch.setattr("wip.iterm2._IS_ITERM2", False)
+        result = runner.invoke(main, ["stale"])
+
+        assert result.exit_code == 0
+        assert "Write tests" in result.output
+        assert "Wait for review" in result.output
+        assert "Design API" not in result.output
+
+    def test_stale_ignores_recent_tasks(self, isolated_storage, runner):
+        """Test that freshly added tasks are not stale."""
+        runner.invoke(main, ["add", "Fresh task"])
+        result = runner.invoke(main, ["stale"])
+
+        assert "No stale tasks" in result.output
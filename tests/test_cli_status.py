@@ -0,0 +1,28 @@
+"""Tests for status command."""
+
+from wip.cli import main
+
+
+class TestStatusCommand:
+    """Tests for wip status command."""
+
+    def test_status_rich_panels(self, isolated_storage_with_sample, monkeypatch, runner):
+        """Test that other terminals get Rich panels by default."""
+        monkeypatch.setattr("wip.iterm2._IS_ITERM2", False)
+        monkeypatch.delenv("WIP_SIMPLE_RENDER", raising=False)
+        result = runner.invoke(main, ["status"])
+
+        assert result.exit_code == 0
+        assert "Design API" in result.output
+        assert "╭" in result.output
+
+    def test_status_simple_render_env(self, isolated_storage_with_sample, monkeypatch, runner):
+        """Test that WIP_SIMPLE_RENDER=1 selects the plain-text renderer."""
+        monkeypatch.setattr("wip.iterm2._IS_ITERM2", False)
+        monkeypatch.setenv("WIP_SIMPLE_RENDER", "1")
+        result = runner.invoke(main, ["status"])
+
+        assert result.exit_code == 0
+        assert "── ACTIVE ──" in result.output
+        assert "Design API" in result.output
+        assert "╭" not in result.output
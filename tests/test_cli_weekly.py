@@ -0,0 +1,49 @@
+"""Tests for weekly command."""
+
+import json
+from datetime import datetime, timedelta
+
+from wip.cli import main
+
+
+class TestWeeklyCommand:
+    """Tests for wip weekly command."""
+
+    def test_weekly_filters_to_this_week(self, isolated_storage, monkeypatch, runner):
+        """Test that only tasks completed since Monday are shown."""
+        monkeypatch.setattr("wip.iterm2._IS_ITERM2", False)
+        today = datetime.now()
+        monday = (today - timedelta(days=today.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+        state_file = isolated_storage["state_file"]
+        state_file.parent.mkdir(parents=True)
+        state_file.write_text(json.dumps({
+            "history": [
+                {"id": 1, "title": "This week", "completed_at": monday.isoformat()},
+                {"id": 2, "title": "Last week", "completed_at": (monday - timedelta(seconds=1)).isoformat()},
+            ],
+        }))
+
+        result = runner.invoke(main, ["weekly"])
+
+        assert result.exit_code == 0
+        assert "This week" in result.output
+        assert "Last week" not in result.output
+
+    def test_weekly_accepts_other_iso_formats(self, isolated_storage, monkeypatch, runner):
+        """Test that timestamps written with a space separator or date only are still matched."""
+        monkeypatch.setattr("wip.iterm2._IS_ITERM2", False)
+        today = datetime.now()
+        monday = (today - timedelta(days=today.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+        state_file = isolated_storage["state_file"]
+        state_file.parent.mkdir(parents=True)
+        state_file.write_text(json.dumps({
+            "history": [
+                {"id": 1, "title": "Space separated", "completed_at": monday.isoformat(sep=" ", timespec="minutes")},
+                {"id": 2, "title": "Date only", "completed_at": monday.date().isoformat()},
+            ],
+        }))
+
+        result = runner.invoke(main, ["weekly"])
+
+        assert "Space separated" in result.output
+        assert "Date only" in result.output
@@ -1,8 +1,10 @@
 """Tests for gist module."""
 
+import gzip
 import json
 from unittest.mock import MagicMock, patch
 
+import wip.gist as gist
 from wip.gist import check_gh_auth, create_gist, delete_gist, update_gist
 
 
@@ -35,6 +37,15 @@ class TestGhAuth:
 
         assert is_auth is False
 
+    def test_gh_auth_cached(self):
+        """Test that gh auth status runs once per process."""
+        with patch("subprocess.run") as mock:
+            mock.return_value = MagicMock(returncode=0)
+            check_gh_auth()
+            check_gh_auth()
+
+        assert mock.call_count == 1
+
 
 class TestCreateGist:
     """Tests for gist creation."""
@@ -43,17 +54,20 @@ class TestCreateGist:
         """Test successful gist creation."""
         with patch("subprocess.run") as mock:
             response = {"id": "abc123", "html_url": "https://gist.github.com/user/abc123"}
-            mock.return_value = MagicMock(returncode=0, stdout=json.dumps(response))
+            mock.return_value = MagicMock(returncode=0, stdout=json.dumps(response).encode())
             result = create_gist("test.md", "# Hello")
 
         assert result.success is True
         assert result.gist_id == "abc123"
         assert "gist.github.com" in result.gist_url
+        payload = mock.call_args.kwargs["input"]
+        assert isinstance(payload, bytes)
+        assert json.loads(payload)["files"] == {"test.md": {"content": "# Hello"}}
 
     def test_create_failure(self):
         """Test failed gist creation."""
         with patch("subprocess.run") as mock:
-            mock.return_value = MagicMock(returncode=1, stderr="Permission denied")
+            mock.return_value = MagicMock(returncode=1, stderr=b"Permission denied")
             result = create_gist("test.md", "# Hello")
 
         assert result.success is False
@@ -84,12 +98,46 @@ class TestUpdateGist:
     def test_update_failure(self):
         """Test failed gist update."""
         with patch("subprocess.run") as mock:
-            mock.return_value = MagicMock(returncode=1, stderr="Not found")
+            mock.return_value = MagicMock(returncode=1, stderr=b"Not found")
             result = update_gist("abc123", "test.html", "<html></html>")
 
         assert result.success is False
         assert "Not found" in result.error
 
+    def test_update_removes_files_in_one_call(self):
+        """Test that removals ride along with the update."""
+        with patch("subprocess.run") as mock:
+            mock.return_value = MagicMock(returncode=0, stdout=b"{}")
+            result = update_gist("abc123", "wip.md", "# wip", remove_files=("wip.html",))
+
+        assert result.success is True
+        assert mock.call_count == 1
+        payload = json.loads(mock.call_args.kwargs["input"])
+        assert payload["files"] == {"wip.html": None, "wip.md": {"content": "# wip"}}
+
+    def test_update_retries_without_removals(self):
+        """Test that a failed combined update falls back to a plain update."""
+        with patch("subprocess.run") as mock:
+            mock.side_effect = [
+                MagicMock(returncode=1, stderr=b"gh: Validation Failed (HTTP 422)"),
+                MagicMock(returncode=0, stdout=b"{}"),
+            ]
+            result = update_gist("abc123", "wip.md", "# wip", remove_files=("wip.html",))
+
+        assert result.success is True
+        payload = json.loads(mock.call_args.kwargs["input"])
+        assert payload["files"] == {"wip.md": {"content": "# wip"}}
+
+    def test_update_other_errors_not_retried_without_removals(self):
+        """Test that only a validation failure triggers the fallback update."""
+        with patch("subprocess.run") as mock:
+            mock.return_value = MagicMock(returncode=1, stderr=b"gh: Not Found (HTTP 404)")
+            result = update_gist("abc123", "wip.md", "# wip", remove_files=("wip.html",))
+
+        assert result.success is False
+        assert "HTTP 404" in result.error
+        assert mock.call_count == 1
+
 
 class TestDeleteGist:
     """Tests for gist deletion."""
@@ -105,8 +153,134 @@ class TestDeleteGist:
     def test_delete_failure(self):
         """Test failed gist deletion."""
         with patch("subprocess.run") as mock:
-            mock.return_value = MagicMock(returncode=1, stderr="Not found")
+            mock.return_value = MagicMock(returncode=1, stderr=b"Not found")
             result = delete_gist("abc123")
 
         assert result.success is False
         assert "Not found" in result.error
+
+
+class TestHttpApi:
+    """Tests for direct HTTPS calls when a token is in the environment."""
+
+    def _mock_connection(self, monkeypatch, status, body):
+        conn = MagicMock(sock=None)
+        conn.getresponse.return_value = MagicMock(
+            status=status, reason="", read=MagicMock(return_value=json.dumps(body).encode())
+        )
+        monkeypatch.setenv("GH_TOKEN", "secret")
+        monkeypatch.setattr(gist, "_connection", None)
+        monkeypatch.setattr(gist.http.client, "HTTPSConnection", MagicMock(return_value=conn))
+        return conn
+
+    def test_token_skips_gh(self, monkeypatch):
+        """Test that a token in the environment bypasses the gh subprocess."""
+        conn = self._mock_connection(monkeypatch, 201, {"id": "abc123", "html_url": "https://gist.github.com/u/abc123"})
+        with patch("subprocess.run") as mock_run:
+            assert check_gh_auth() == (True, None)
+            result = create_gist("test.md", "# Hello")
+
+        mock_run.assert_not_called()
+        assert result.success is True
+        assert result.gist_id == "abc123"
+        method, path = conn.request.call_args.args
+        assert (method, path) == ("POST", "/gists")
+        assert conn.request.call_args.kwargs["headers"]["Authorization"] == "Bearer secret"
+
+    def test_connection_reused(self, monkeypatch):
+        """Test that consecutive calls share one connection."""
+        self._mock_connection(monkeypatch, 200, {})
+        update_gist("abc123", "wip.md", "one")
+        update_gist("abc123", "wip.md", "two")
+
+        assert gist.http.client.HTTPSConnection.call_count == 1
+
+    def test_http_error_message(self, monkeypatch):
+        """Test that API error messages are surfaced."""
+        self._mock_connection(monkeypatch, 404, {"message": "Not Found"})
+        result = update_gist("abc123", "wip.md", "content")
+
+        assert result.success is False
+        assert "404" in result.error
+        assert "Not Found" in result.error
+
+    def test_gzip_response(self, monkeypatch):
+        """Test that gzip-encoded responses are decompressed."""
+        conn = self._mock_connection(monkeypatch, 201, {})
+        response = conn.getresponse.return_value
+        response.read.return_value = gzip.compress(json.dumps({"id": "abc123"}).encode())
+        response.getheader.side_effect = lambda name: "gzip" if name == "Content-Encoding" else None
+        result = create_gist("test.md", "# Hello")
+
+        assert result.gist_id == "abc123"
+        assert conn.request.call_args.kwargs["headers"]["Accept-Encoding"] == "gzip"
+
+
+class TestRetry:
+    """Tests for retrying transient API failures."""
+
+    def test_retries_server_error(self, monkeypatch):
+        """Test that a 5xx from gh is retried until it succeeds."""
+        monkeypatch.setattr(gist.time, "sleep", lambda _: None)
+        with patch("subprocess.run") as mock:
+            mock.side_effect = [
+                MagicMock(returncode=1, stderr=b"gh: Server Error (HTTP 502)"),
+                MagicMock(returncode=0),
+            ]
+            result = update_gist("abc123", "wip.md", "content")
+
+        assert result.success is True
+        assert mock.call_count == 2
+
+    def test_gives_up_after_max_retries(self, monkeypatch):
+        """Test that persistent rate limiting fails after the retry budget."""
+        monkeypatch.setattr(gist.time, "sleep", lambda _: None)
+        with patch("subprocess.run") as mock:
+            mock.return_value = MagicMock(returncode=1, stderr=b"gh: rate limited (HTTP 429)")
+            result = update_gist("abc123", "wip.md", "content")
+
+        assert result.success is False
+        assert "429" in result.error
+        assert mock.call_count == gist.MAX_RETRIES + 1
+
+    def test_create_not_retried_on_timeout(self, monkeypatch):
+        """Test that gist creation is not retried when it may have gone through."""
+        import subprocess
+
+        monkeypatch.setattr(gist.time, "sleep", lambda _: None)
+        with patch("subprocess.run") as mock:
+            mock.side_effect = subprocess.TimeoutExpired("gh", 30)
+            result = create_gist("test.md", "# Hello")
+
+        assert result.success is False
+        assert "timed out" in result.error
+        assert mock.call_count == 1
+
+    def test_retries_stop_at_deadline(self, monkeypatch):
+        """Test that timeouts plus backoff never run past the total retry deadline."""
+        import subprocess
+
+        now = [0.0]
+
+        def fake_sleep(seconds):
+            now[0] += seconds
+
+        def timing_out_run(args, timeout, **kwargs):
+            now[0] += timeout
+            raise subprocess.TimeoutExpired("gh", timeout)
+
+        monkeypatch.setattr(gist.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(gist.time, "sleep", fake_sleep)
+        with patch("subprocess.run", side_effect=timing_out_run) as mock:
+            result = update_gist("abc123", "wip.md", "content")
+
+        assert result.success is False
+        assert "timed out" in result.error
+        assert mock.call_count == 2
+        assert mock.call_args.kwargs["timeout"] < 15
+        assert now[0] <= gist.RETRY_DEADLINE
+
+    def test_retry_after_is_capped(self):
+        """Test that server-provided delays are honored but capped."""
+        assert gist._retry_delay(0, retry_after=2.0) == 2.0
+        assert gist._retry_delay(0, retry_after=3600.0) == gist.RETRY_MAX_DELAY
@@ -0,0 +1,68 @@
+"""Tests for iTerm2 inline image support."""
+
+import base64
+from unittest.mock import patch
+
+import pytest
+
+import wip.iterm2 as iterm2
+from wip.iterm2 import FALLBACK_EMOJI, bufo, inline_image_escape
+
+
+@pytest.fixture(autouse=True)
+def clear_image_caches():
+    """Don't let cached escapes leak between tests."""
+    inline_image_escape.cache_clear()
+    iterm2._bufo_escape.cache_clear()
+    yield
+    inline_image_escape.cache_clear()
+    iterm2._bufo_escape.cache_clear()
+
+
+class TestBufo:
+    """Tests for bufo image rendering."""
+
+    def test_fallback_outside_iterm2(self, monkeypatch):
+        """Test that other terminals get the emoji fallback."""
+        monkeypatch.setattr("wip.iterm2._IS_ITERM2", False)
+        assert bufo("active") == FALLBACK_EMOJI["active"]
+
+    def test_inline_image_in_iterm2(self, monkeypatch):
+        """Test that iTerm2 gets an inline image escape sequence."""
+        monkeypatch.setattr("wip.iterm2._IS_ITERM2", True)
+        assert bufo("done").startswith("\x1b]1337;File=")
+
+    def test_detection_reads_term_program(self, monkeypatch):
+        """Test that detection follows TERM_PROGRAM when refreshed."""
+        monkeypatch.setattr(iterm2, "_IS_ITERM2", False)
+        monkeypatch.setenv("TERM_PROGRAM", "iTerm.app")
+        iterm2._refresh_iterm2_detection()
+
+        assert iterm2.is_iterm2() is True
+
+    def test_image_encoded_once(self, monkeypatch):
+        """Test that repeated rows reuse the encoded image."""
+        monkeypatch.setattr("wip.iterm2._IS_ITERM2", True)
+        with patch("wip.iterm2.base64.b64encode", wraps=base64.b64encode) as mock:
+            for _ in range(5):
+                bufo("hold")
+
+        assert mock.call_count == 1
+
+    def test_missing_image_falls_back(self, monkeypatch, tmp_path):
+        """Test that a missing image file falls back to the emoji."""
+        monkeypatch.setattr("wip.iterm2._IS_ITERM2", True)
+        monkeypatch.setattr("wip.iterm2.ASSETS_DIR", tmp_path)
+
+        assert bufo("stale") == FALLBACK_EMOJI["stale"]
+
+    def test_no_stat_per_render(self, monkeypatch):
+        """Test that repeated renders don't touch the filesystem."""
+        monkeypatch.setattr("wip.iterm2._IS_ITERM2", True)
+        bufo("active")
+        with patch("pathlib.Path.read_bytes") as read, patch("pathlib.Path.exists") as exists:
+            for _ in range(5):
+                bufo("active")
+
+        read.assert_not_called()
+        exists.assert_not_called()
@@ -15,6 +15,11 @@ class TestTask:
         assert task.title == "Test task"
         assert task.active is False
 
+    def test_slotted(self):
+        """Test tasks use slots rather than a per-instance __dict__."""
+        task = Task(id=1, title="Test task")
+        assert not hasattr(task, "__dict__")
+
     def test_create_active_task(self):
         """Test creating an active task."""
         task = Task(id=1, title="Active task", active=True)
@@ -42,7 +47,7 @@ class TestTask:
 
 
 class TestEdge:
-    """Tests for Edge dataclass."""
+    """Tests for Edge named tuple."""
 
     def test_create_edge(self):
         """Test creating an edge."""
@@ -63,6 +68,11 @@ class TestEdge:
         assert edge.from_id == 1
         assert edge.to_id == 2
 
+    def test_hashable(self):
+        """Test edges compare and hash by value."""
+        assert Edge(1, 2) == Edge(from_id=1, to_id=2)
+        assert len({Edge(1, 2), Edge(1, 2), Edge(2, 1)}) == 2
+
 
 class TestBlockedTask:
     """Tests for BlockedTask dataclass."""
@@ -124,6 +134,13 @@ class TestHistoryEntry:
         assert dt.hour == 10
         assert dt.minute == 30
 
+    def test_datetime_parsed_once(self):
+        """Test repeated access reuses the parsed datetime."""
+        entry = HistoryEntry(id=1, title="Done task", completed_at="2025-01-13T10:30:00")
+        other = HistoryEntry(id=2, title="Other", completed_at="2025-01-13T10:30:00")
+        assert entry.completed_datetime is entry.completed_datetime
+        assert other.completed_datetime is entry.completed_datetime
+
 
 class TestConfig:
     """Tests for Config dataclass."""
@@ -145,7 +162,7 @@ class TestConfig:
         assert d == {
             "max_active": 3,
             "stale_days": 14,
-            "share": {"enabled": False, "gist_id": None, "gist_url": None},
+            "share": {"enabled": False, "gist_id": None, "gist_url": None, "content_hash": None},
         }
 
     def test_from_dict(self):
@@ -181,14 +198,14 @@ class TestState:
         expected = sample_state.copy()
         expected["config"] = {
             **sample_state["config"],
-            "share": {"enabled": False, "gist_id": None, "gist_url": None},
+            "share": {"enabled": False, "gist_id": None, "gist_url": None, "content_hash": None},
         }
         assert d == expected
 
     def test_from_dict(self, sample_state):
         """Test creating state from dictionary."""
         state = State.from_dict(sample_state)
-        assert len(state.tasks) == 3
+        assert list(state.tasks) == [1, 2, 3]
         assert len(state.edges) == 1
         assert len(state.blocked) == 1
         assert len(state.history) == 1
@@ -228,6 +245,18 @@ class TestState:
         state = State.from_dict(sample_state)
         assert state.active_count() == 1
 
+    def test_active_count_tracks_mutations(self, sample_state):
+        """Test the active count follows task helpers after it is first computed."""
+        state = State.from_dict(sample_state)
+        assert state.active_count() == 1
+        state.set_active(state.get_task(2), True)
+        assert state.active_count() == 2
+        state.add_task(Task(id=7, title="New", active=True))
+        assert state.active_count() == 3
+        state.remove_task(1)
+        state.set_active(state.get_task(7), False)
+        assert state.active_count() == 1
+
     def test_has_edge_true(self, sample_state):
         """Test checking for existing edge."""
         state = State.from_dict(sample_state)
@@ -251,3 +280,80 @@ class TestState:
         edges = state.get_edges_to(2)
         assert len(edges) == 1
         assert edges[0].from_id == 1
+
+    def test_get_edges_after_add(self, sample_state):
+        """Test edge queries reflect edges added after the index is built."""
+        state = State.from_dict(sample_state)
+        assert state.get_edges_to(3) == []
+        state.add_edge(2, 3)
+        assert state.get_edges_to(3) == [Edge(from_id=2, to_id=3)]
+        assert state.get_edges_from(2) == [Edge(from_id=2, to_id=3)]
+
+    def test_get_adjacency(self, sample_state):
+        """Test adjacency maps each task to its dependents."""
+        state = State.from_dict(sample_state)
+        assert state.get_adjacency() == {1: [2]}
+
+    def test_adjacency_tracks_edge_mutations(self, sample_state):
+        """Test adjacency is rebuilt after edges change."""
+        state = State.from_dict(sample_state)
+        state.get_adjacency()
+        state.add_edge(2, 3)
+        assert state.get_adjacency() == {1: [2], 2: [3]}
+        state.remove_task_edges(2)
+        assert state.get_adjacency() == {}
+
+    def test_remove_blocked(self, sample_state):
+        """Test removing a blocked task keeps lookups in sync."""
+        state = State.from_dict(sample_state)
+        removed = state.remove_blocked(4)
+        assert removed is not None
+        assert removed.blocker == "Alice"
+        assert state.blocked == []
+        assert state.get_blocked(4) is None
+        assert state.remove_blocked(4) is None
+
+    def test_add_blocked_after_lookup(self, sample_state):
+        """Test blocked tasks added after a lookup are found."""
+        state = State.from_dict(sample_state)
+        assert state.get_blocked(7) is None
+        state.add_blocked(BlockedTask(id=7, title="New", blocker="Bob"))
+        assert state.get_blocked(7).blocker == "Bob"
+
+    def test_add_blocked_many(self, sample_state):
+        """Test adding several blocked tasks at once."""
+        state = State.from_dict(sample_state)
+        state.get_blocked(4)
+        state.add_blocked(BlockedTask(id=7, title="A", blocker="Bob"), BlockedTask(id=8, title="B", blocker="Bob"))
+        assert [b.id for b in state.blocked] == [4, 7, 8]
+        assert state.get_blocked(8).title == "B"
+
+    def test_get_and_remove_history(self, sample_state):
+        """Test looking up and removing history entries by ID."""
+        state = State.from_dict(sample_state)
+        assert state.get_history(5).title == "Set up repo"
+        state.remove_history(5)
+        assert state.history == []
+        assert state.get_history(5) is None
+
+    def test_get_reverse_adjacency(self, sample_state):
+        """Test reverse adjacency maps each task to its dependencies."""
+        state = State.from_dict(sample_state)
+        assert state.get_reverse_adjacency() == {2: [1]}
+
+    def test_remove_edge(self, sample_state):
+        """Test removing an edge updates the list in place and the indexes."""
+        state = State.from_dict(sample_state)
+        edges = state.edges
+        state.add_edge(1, 3)
+        state.remove_edge(1, 2)
+        assert state.edges is edges
+        assert [(e.from_id, e.to_id) for e in state.edges] == [(1, 3)]
+        assert state.get_adjacency() == {1: [3]}
+        assert state.get_reverse_adjacency() == {3: [1]}
+
+    def test_remove_task_edges_without_edges(self, sample_state):
+        """Test removing edges of an unlinked task leaves edges untouched."""
+        state = State.from_dict(sample_state)
+        state.remove_task_edges(3)
+        assert len(state.edges) == 1
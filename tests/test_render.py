@@ -0,0 +1,68 @@
+"""Tests for terminal rendering."""
+
+from wip.render import _build_dag_content, _build_dag_content_simple, _get_descendants, _wrap_text
+
+
+def _label(tid: int) -> str:
+    return f"* [{tid}]"
+
+
+def _plain(tid: int) -> str:
+    return f"[{tid}]"
+
+
+class TestDagContent:
+    """Tests for tree layout of task panels."""
+
+    def test_tree_layout(self):
+        """Test connectors, sibling order and isolated tasks."""
+        adjacency = {1: [3, 2], 2: [4]}
+        content = _build_dag_content({1, 2, 3, 4, 5}, adjacency, _label, _plain)
+
+        assert content.splitlines() == [
+            "* [1]",
+            "├── [2]",
+            "│   └── [4]",
+            "└── [3]",
+            "* [5]",
+        ]
+
+    def test_cycle_rendered_once(self):
+        """Test that tasks in a cycle are each shown once."""
+        adjacency = {1: [2], 2: [1]}
+        lines = _build_dag_content_simple({1, 2}, adjacency, _label, _plain, None)
+
+        assert lines == ["  * [1]", "  └── [2]"]
+
+    def test_links_outside_panel_ignored(self):
+        """Test that links to tasks in other panels don't make a tree."""
+        adjacency = {1: [2], 3: [1]}
+        content = _build_dag_content({1, 4}, adjacency, _label, _plain)
+
+        assert content.splitlines() == ["* [1]", "* [4]"]
+
+
+class TestDescendants:
+    """Tests for finding the active workflow."""
+
+    def test_multiple_roots_share_subtree(self):
+        """Test reachability from several roots, excluding the roots."""
+        adjacency = {1: [3], 2: [3, 1], 3: [4], 5: [6]}
+
+        assert _get_descendants({1, 2}, adjacency) == {3, 4}
+
+
+class TestWrapText:
+    """Tests for wrapping titles in weekly columns."""
+
+    def test_short_text_unchanged(self):
+        """Test that text within the width is a single line."""
+        assert _wrap_text("Fix bug", 16) == ["Fix bug"]
+
+    def test_breaks_at_spaces(self):
+        """Test that lines break at the last space that fits."""
+        assert _wrap_text("Write the   release notes", 10) == ["Write the", "release", "notes"]
+
+    def test_long_word_split(self):
+        """Test that a word longer than the width is cut."""
+        assert _wrap_text("abcdefghij", 4) == ["abcd", "efgh", "ij"]
@@ -1,7 +1,7 @@
 """Tests for Markdown rendering."""
 
 from wip.model import BlockedTask, HistoryEntry, State, Task
-from wip.render_md import render_state_md
+from wip.render_md import content_digest, render_state_md
 
 
 class TestRenderMd:
@@ -18,7 +18,7 @@ class TestRenderMd:
     def test_render_with_active_task(self):
         """Test rendering state with active task."""
         state = State()
-        state.tasks["1"] = Task(id=1, title="Test task", active=True)
+        state.tasks[1] = Task(id=1, title="Test task", active=True)
 
         md = render_state_md(state)
 
@@ -39,13 +39,31 @@ class TestRenderMd:
     def test_render_with_backlog(self):
         """Test rendering state with backlog task."""
         state = State()
-        state.tasks["1"] = Task(id=1, title="Backlog task", active=False)
+        state.tasks[1] = Task(id=1, title="Backlog task", active=False)
 
         md = render_state_md(state)
 
         assert "Backlog task" in md
         assert "## Backlog" in md
 
+    def test_render_active_workflow(self):
+        """Test that inactive descendants of an active task leave the backlog."""
+        state = State()
+        state.add_task(
+            Task(id=1, title="Active root", active=True),
+            Task(id=2, title="Next step"),
+            Task(id=3, title="Final step"),
+            Task(id=4, title="Unrelated"),
+        )
+        state.add_edge(1, 2)
+        state.add_edge(2, 3)
+
+        md = render_state_md(state)
+        top, backlog = md.split("## Backlog")
+
+        assert "- **[1] Active root**\n  - *[2] Next step*\n    - *[3] Final step*" in top
+        assert "Unrelated" in backlog
+
     def test_render_includes_timestamp(self):
         """Test that Markdown includes last updated timestamp."""
         state = State()
@@ -69,3 +87,14 @@ class TestRenderMd:
         assert "Completed task" in md
         assert "## This Week" in md
         assert "1 completed" in md
+
+    def test_content_digest_ignores_timestamp(self):
+        """Test that the digest only changes when the content changes."""
+        state = State()
+        md = render_state_md(state)
+        later = md.replace("*Updated: ", "*Updated: 1999-01-01 00:00 ")
+
+        assert content_digest(md) == content_digest(later)
+
+        state.tasks[1] = Task(id=1, title="Backlog task")
+        assert content_digest(render_state_md(state)) != content_digest(md)
@@ -2,8 +2,6 @@
 
 from unittest.mock import patch
 
-from click.testing import CliRunner
-
 from wip.cli import main
 from wip.gist import GistResult
 
@@ -11,27 +9,23 @@ from wip.gist import GistResult
 class TestShareCommand:
     """Tests for wip share command."""
 
-    def test_share_status_disabled(self, isolated_storage):
+    def test_share_status_disabled(self, isolated_storage, runner):
         """Test share --status when disabled."""
-        runner = CliRunner()
         result = runner.invoke(main, ["share", "--status"])
 
         assert result.exit_code == 0
         assert "disabled" in result.output
 
-    def test_share_status_enabled(self, isolated_storage_with_share):
+    def test_share_status_enabled(self, isolated_storage_with_share, runner):
         """Test share --status when enabled."""
-        runner = CliRunner()
         result = runner.invoke(main, ["share", "--status"])
 
         assert result.exit_code == 0
         assert "enabled" in result.output
         assert "https://gist.github.com" in result.output
 
-    def test_share_no_auth(self, isolated_storage):
+    def test_share_no_auth(self, isolated_storage, runner):
         """Test share fails gracefully when gh not authenticated."""
-        runner = CliRunner()
-
         with patch("wip.gist.check_gh_auth") as mock:
             mock.return_value = (False, "gh CLI not installed")
             result = runner.invoke(main, ["share"])
@@ -39,10 +33,8 @@ class TestShareCommand:
         assert "gh CLI not installed" in result.output
         assert "gh auth login" in result.output
 
-    def test_share_creates_gist(self, isolated_storage):
+    def test_share_creates_gist(self, isolated_storage, runner):
         """Test share creates a new gist."""
-        runner = CliRunner()
-
         with (
             patch("wip.gist.check_gh_auth") as mock_auth,
             patch("wip.gist.create_gist") as mock_create,
@@ -60,10 +52,8 @@ class TestShareCommand:
         assert "Sharing enabled" in result.output
         assert "https://gist.github.com" in result.output
 
-    def test_share_already_enabled(self, isolated_storage_with_share):
+    def test_share_already_enabled(self, isolated_storage_with_share, runner):
         """Test share when already enabled shows URL."""
-        runner = CliRunner()
-
         with patch("wip.gist.check_gh_auth") as mock_auth:
             mock_auth.return_value = (True, None)
             result = runner.invoke(main, ["share"])
@@ -71,10 +61,8 @@ class TestShareCommand:
         assert "already enabled" in result.output
         assert "--refresh" in result.output
 
-    def test_share_disable(self, isolated_storage_with_share):
+    def test_share_disable(self, isolated_storage_with_share, runner):
         """Test share --disable removes sharing."""
-        runner = CliRunner()
-
         with patch("wip.gist.delete_gist") as mock_delete:
             mock_delete.return_value = GistResult(success=True)
             result = runner.invoke(main, ["share", "--disable"])
@@ -82,17 +70,14 @@ class TestShareCommand:
         assert result.exit_code == 0
         assert "disabled" in result.output
 
-    def test_share_disable_when_not_enabled(self, isolated_storage):
+    def test_share_disable_when_not_enabled(self, isolated_storage, runner):
         """Test share --disable when already disabled."""
-        runner = CliRunner()
         result = runner.invoke(main, ["share", "--disable"])
 
         assert "already disabled" in result.output
 
-    def test_share_refresh(self, isolated_storage_with_share):
+    def test_share_refresh(self, isolated_storage_with_share, runner):
         """Test share --refresh updates gist."""
-        runner = CliRunner()
-
         with patch("wip.gist.update_gist") as mock_update:
             mock_update.return_value = GistResult(success=True, gist_id="test123")
             result = runner.invoke(main, ["share", "--refresh"])
@@ -100,9 +85,8 @@ class TestShareCommand:
         assert result.exit_code == 0
         assert "Updated" in result.output
 
-    def test_share_refresh_not_enabled(self, isolated_storage):
+    def test_share_refresh_not_enabled(self, isolated_storage, runner):
         """Test share --refresh when not enabled."""
-        runner = CliRunner()
         result = runner.invoke(main, ["share", "--refresh"])
 
         assert "not enabled" in result.output
@@ -1,9 +1,92 @@
 """Tests for JSON persistence."""
 
 import json
+from pathlib import Path
+from unittest.mock import patch
 
-from wip.model import State, Task
-from wip.storage import load_state, save_state, backup_state
+import pytest
+
+from wip.model import ShareConfig, State, Task
+from wip.storage import backup_state, decode_json, dump_json, encode_json, load_state, save_state
+
+
+class TestJsonCodec:
+    """Tests for the JSON encode/decode helpers."""
+
+    def test_round_trip(self, sample_state):
+        """Test encoded bytes decode back to the same data."""
+        assert decode_json(encode_json(sample_state)) == sample_state
+
+    def test_indent(self, sample_state):
+        """Test indent produces pretty-printed output."""
+        raw = encode_json(sample_state, indent=True)
+        assert raw.startswith(b'{\n  "tasks"')
+
+    def test_stdlib_fallback(self, monkeypatch, sample_state):
+        """Test the helpers work without orjson installed."""
+        import wip.storage as storage
+
+        monkeypatch.setattr(storage, "orjson", None)
+        raw = encode_json(sample_state, indent=True)
+        assert json.loads(raw) == sample_state
+        assert decode_json(raw) == sample_state
+
+    @pytest.mark.parametrize("indent", [False, True])
+    def test_dump_stdlib_fallback(self, monkeypatch, tmp_path, sample_state, indent):
+        """Test dump_json streams the same output through the stdlib encoder."""
+        import wip.storage as storage
+
+        path = tmp_path / "out.json"
+        dump_json(sample_state, path, indent=indent)
+        expected = path.read_bytes()
+
+        monkeypatch.setattr(storage, "orjson", None)
+        dump_json(sample_state, path, indent=indent)
+        assert path.read_bytes() == expected
+        assert encode_json(sample_state, indent=indent) == expected
+
+    def test_dump_failure_keeps_old_file(self, tmp_path):
+        """Test that a failed write leaves the previous file intact."""
+        path = tmp_path / "out.json"
+        dump_json({"ok": True}, path)
+
+        with pytest.raises(TypeError):
+            dump_json({"bad": object()}, path)
+
+        assert decode_json(path.read_bytes()) == {"ok": True}
+        assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+
+    def test_dump_uses_unique_temp_files(self, tmp_path, monkeypatch):
+        """Test that each write gets its own temp file, so concurrent writers can't collide."""
+        import os
+
+        import wip.storage as storage
+
+        temps = []
+        real_replace = os.replace
+
+        def spy_replace(src, dst):
+            temps.append(src)
+            real_replace(src, dst)
+
+        monkeypatch.setattr(storage.os, "replace", spy_replace)
+        path = tmp_path / "out.json"
+        dump_json({"n": 1}, path)
+        dump_json({"n": 2}, path)
+
+        assert len(set(temps)) == 2
+        assert all(t.parent == tmp_path for t in temps)
+
+    def test_dump_new_file_mode(self, tmp_path):
+        """Test that a newly created file gets the umask-based mode, not the temp file's 0600."""
+        import os
+
+        umask = os.umask(0)
+        os.umask(umask)
+        path = tmp_path / "out.json"
+        dump_json({}, path)
+
+        assert path.stat().st_mode & 0o777 == 0o666 & ~umask
 
 
 class TestLoadState:
@@ -34,6 +117,28 @@ class TestLoadState:
         assert state.tasks == {}
         assert state.next_id == 1
 
+    def test_load_reuses_parse(self, sample_state_file, monkeypatch):
+        """Test repeated loads of an unchanged file parse it once but return separate states."""
+        import wip.storage as storage
+
+        calls = []
+        monkeypatch.setattr(storage, "decode_json", lambda raw: calls.append(raw) or json.loads(raw))
+        monkeypatch.setattr(storage, "_load_cache", None)
+
+        first = load_state(sample_state_file)
+        first.tasks[1].title = "Changed"
+        second = load_state(sample_state_file)
+
+        assert len(calls) == 1
+        assert second.tasks[1].title == "Design API"
+
+    def test_load_sees_external_write(self, sample_state_file):
+        """Test a file rewritten outside save_state is read again."""
+        load_state(sample_state_file)
+        sample_state_file.write_text(json.dumps({"next_id": 42}))
+
+        assert load_state(sample_state_file).next_id == 42
+
 
 class TestSaveState:
     """Tests for save_state function."""
@@ -45,19 +150,26 @@ class TestSaveState:
         save_state(state, state_file)
 
         assert state_file.exists()
-        data = json.loads(state_file.read_text())
+        data = json.loads(state_file.read_bytes())
         assert data["tasks"] == {}
         assert data["next_id"] == 1
 
+    def test_save_is_compact(self, tmp_path):
+        """Test the state file is written without indentation."""
+        state_file = tmp_path / ".wip" / "state.json"
+        save_state(State(), state_file)
+
+        assert state_file.read_text().count("\n") == 1
+
     def test_save_state_with_tasks(self, tmp_path):
         """Test saving a state with tasks."""
         state_file = tmp_path / ".wip" / "state.json"
         state = State()
-        state.tasks["1"] = Task(id=1, title="Test task", active=True)
+        state.tasks[1] = Task(id=1, title="Test task", active=True)
         state.next_id = 2
         save_state(state, state_file)
 
-        data = json.loads(state_file.read_text())
+        data = json.loads(state_file.read_bytes())
         assert "1" in data["tasks"]
         assert data["tasks"]["1"]["title"] == "Test task"
         assert data["next_id"] == 2
@@ -70,42 +182,223 @@ class TestSaveState:
 
         assert state_file.exists()
 
+    def test_save_through_symlink(self, tmp_path):
+        """Test saving to a symlinked state file updates the target and keeps the link."""
+        target = tmp_path / "dotfiles" / "state.json"
+        save_state(State(), target)
+        target.chmod(0o600)
+        link = tmp_path / ".wip" / "state.json"
+        link.parent.mkdir()
+        link.symlink_to(target)
+
+        save_state(State(next_id=7), link)
+
+        assert link.is_symlink()
+        assert json.loads(target.read_bytes())["next_id"] == 7
+        assert target.stat().st_mode & 0o777 == 0o600
+        assert [p.name for p in target.parent.iterdir()] == ["state.json"]
+
+    def test_save_creates_directory_once(self, tmp_path):
+        """Test repeated saves don't recreate the directory."""
+        state_file = tmp_path / "once" / "state.json"
+        with patch("pathlib.Path.mkdir", autospec=True, side_effect=Path.mkdir) as mock:
+            save_state(State(), state_file)
+            save_state(State(next_id=2), state_file)
+
+        assert mock.call_count == 1
+
+    def test_save_recreates_removed_directory(self, tmp_path):
+        """Test saving after the state directory was deleted mid-process."""
+        import shutil
+
+        state_file = tmp_path / "gone" / "state.json"
+        save_state(State(), state_file)
+        shutil.rmtree(state_file.parent)
+
+        save_state(State(next_id=3), state_file)
+        assert json.loads(state_file.read_bytes())["next_id"] == 3
+
     def test_save_overwrites_existing(self, state_file):
         """Test save_state overwrites existing file."""
         state = load_state(state_file)
-        state.tasks["1"] = Task(id=1, title="New task")
+        state.tasks[1] = Task(id=1, title="New task")
         state.next_id = 2
         save_state(state, state_file)
 
         # Load again to verify
         state2 = load_state(state_file)
-        assert "1" in state2.tasks
-        assert state2.tasks["1"].title == "New task"
+        assert 1 in state2.tasks
+        assert state2.tasks[1].title == "New task"
+
+    def test_save_unchanged_skips_write(self, tmp_path, monkeypatch):
+        """Test that saving exactly what was loaded leaves the file alone."""
+        import wip.storage as storage
+
+        state_file = tmp_path / "state.json"
+        state = State()
+        state.add_task(Task(id=1, title="Task"))
+        save_state(state, state_file)
+
+        writes = []
+        monkeypatch.setattr(storage, "dump_json", lambda *args, **kwargs: writes.append(args))
+        save_state(load_state(state_file), state_file)
+        assert writes == []
+
+        changed = load_state(state_file)
+        changed.tasks[1].title = "Renamed"
+        save_state(changed, state_file)
+        assert len(writes) == 1
+
+
+class TestAutoPublish:
+    """Tests for auto-publishing on save."""
+
+    def test_publish_skipped_when_unchanged(self, tmp_path, monkeypatch):
+        """Test that saving unchanged content doesn't republish."""
+        import wip.storage as storage
+
+        published = []
+        monkeypatch.setattr(storage, "_auto_publish_enabled", True)
+        monkeypatch.setattr(storage, "_auto_publish", lambda gist_id, md, state_file: published.append(md))
+
+        state_file = tmp_path / "state.json"
+        state = State()
+        state.config.share = ShareConfig(enabled=True, gist_id="abc123")
+
+        save_state(state, state_file)
+        save_state(state, state_file)
+        assert len(published) == 1
+
+        state.tasks[1] = Task(id=1, title="New task")
+        save_state(state, state_file)
+        assert len(published) == 2
+        assert "New task" in published[-1]
+
+        # The digest is persisted so later commands also skip
+        reloaded = load_state(state_file)
+        save_state(reloaded, state_file)
+        assert len(published) == 2
+
+    def test_publish_failure_suggests_refresh(self, capsys):
+        """Test that a failed background publish tells the user how to retry."""
+        import wip.storage as storage
+        from wip.gist import GistResult
+
+        with patch("wip.gist.update_gist", return_value=GistResult(success=False, error="boom")):
+            storage._auto_publish("abc123", "# wip")
+            storage._wait_for_publish()
+
+        err = capsys.readouterr().err
+        assert "boom" in err
+        assert "wip share --refresh" in err
+
+    def test_publish_failure_retried_on_next_save(self, tmp_path, monkeypatch):
+        """Test that a failed publish doesn't leave its hash saved, so the next save retries."""
+        import wip.storage as storage
+        from wip.gist import GistResult
+
+        monkeypatch.setattr(storage, "_auto_publish_enabled", True)
+        state_file = tmp_path / "state.json"
+        state = State()
+        state.config.share = ShareConfig(enabled=True, gist_id="abc123")
+
+        with patch("wip.gist.update_gist", return_value=GistResult(success=False, error="boom")):
+            save_state(state, state_file)
+            storage._wait_for_publish()
+        assert load_state(state_file).config.share.content_hash is None
+
+        with patch("wip.gist.update_gist", return_value=GistResult(success=True)) as mock_update:
+            save_state(load_state(state_file), state_file)
+            storage._wait_for_publish()
+        mock_update.assert_called_once()
+        assert load_state(state_file).config.share.content_hash is not None
+
+    def test_publish_coalesces_pending_updates(self):
+        """Test that saves during a publish collapse into one follow-up update."""
+        import threading
+
+        import wip.storage as storage
+        from wip.gist import GistResult
+
+        started = threading.Event()
+        release = threading.Event()
+        sent = []
+
+        def fake_update(gist_id, filename, content):
+            sent.append(content)
+            started.set()
+            release.wait(5)
+            return GistResult(success=True, gist_id=gist_id)
+
+        with patch("wip.gist.update_gist", side_effect=fake_update):
+            storage._auto_publish("abc123", "v1")
+            started.wait(5)
+            storage._auto_publish("abc123", "v2")
+            storage._auto_publish("abc123", "v3")
+            release.set()
+            storage._wait_for_publish()
+
+        assert sent == ["v1", "v3"]
+
+    def test_exit_hook_registered_on_first_publish(self, monkeypatch):
+        """Test that the exit-time wait is only registered once something publishes."""
+        import wip.storage as storage
+        from wip.gist import GistResult
+
+        monkeypatch.setattr(storage, "_atexit_registered", False)
+        with patch("atexit.register") as register:
+            with patch("wip.gist.update_gist", return_value=GistResult(success=True)):
+                storage._auto_publish("abc123", "v1")
+                storage._auto_publish("abc123", "v2")
+                storage._wait_for_publish()
+
+        register.assert_called_once_with(storage._wait_for_publish)
 
 
 class TestBackupState:
     """Tests for backup_state function."""
 
-    def test_backup_existing_state(self, sample_state_file, tmp_path):
+    def test_backup_existing_state(self, sample_state_file, tmp_path, monkeypatch):
         """Test backing up an existing state file."""
-        # Set up backup directory in tmp_path
         import wip.storage as storage
 
-        original_backup_dir = storage.BACKUP_DIR
-        storage.BACKUP_DIR = tmp_path / "backups"
-
-        try:
-            backup_path = backup_state(sample_state_file)
-            assert backup_path is not None
-            assert backup_path.exists()
-            assert backup_path.parent == storage.BACKUP_DIR
-
-            # Verify backup content matches original
-            original = json.loads(sample_state_file.read_text())
-            backup = json.loads(backup_path.read_text())
-            assert original == backup
-        finally:
-            storage.BACKUP_DIR = original_backup_dir
+        monkeypatch.setattr(storage, "BACKUP_DIR", tmp_path / "backups")
+
+        backup_path = backup_state(sample_state_file)
+        assert backup_path is not None
+        assert backup_path.exists()
+        assert backup_path.parent == storage.BACKUP_DIR
+
+        # Backups are byte-for-byte copies (or links) of the state file
+        assert backup_path.read_bytes() == sample_state_file.read_bytes()
+
+    def test_backup_unaffected_by_later_save(self, tmp_path, monkeypatch):
+        """Test that saving after a backup doesn't change the backup."""
+        import wip.storage as storage
+
+        monkeypatch.setattr(storage, "BACKUP_DIR", tmp_path / "backups")
+        state_file = tmp_path / "state.json"
+        state = State()
+        state.add_task(Task(id=1, title="Before"))
+        save_state(state, state_file)
+
+        backup_path = backup_state(state_file)
+        state.tasks[1].title = "After"
+        save_state(state, state_file)
+
+        assert load_state(backup_path).tasks[1].title == "Before"
+        assert load_state(state_file).tasks[1].title == "After"
+
+    def test_backup_recreates_removed_directory(self, sample_state_file, tmp_path, monkeypatch):
+        """Test backing up after the backup directory was deleted mid-process."""
+        import wip.storage as storage
+
+        monkeypatch.setattr(storage, "BACKUP_DIR", tmp_path / "backups")
+        backup_state(sample_state_file).unlink()
+        storage.BACKUP_DIR.rmdir()
+
+        backup_path = backup_state(sample_state_file)
+        assert backup_path.read_bytes() == sample_state_file.read_bytes()
 
     def test_backup_nonexistent_file(self, tmp_path):
         """Test backing up a non-existent file returns None."""